@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""Headless benchmark suite for the render and physics hot paths.
+
+Each case is timed on its own under SDL_VIDEODRIVER=dummy: the median and
+minimum of several rounds, in milliseconds per call. Results are written
+as JSON. With --baseline, each case is compared with an earlier run, and
+any case slower than the threshold makes the exit status 1, so a
+performance change can be checked with:
+
+    python3 bench/bench.py --output before.json
+    # ... change the code ...
+    python3 bench/bench.py --baseline before.json --threshold 0.10
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import numpy as np
+import pygame
+import main as game
+import game_storage
+import physics
+import replay
+import world_cache
+
+BENCH_SEED = 12345
+# Frames and shot interval of the scripted match
+MATCH_FRAMES = 1800
+MATCH_SHOT_EVERY = 150
+
+def time_case(func, number, rounds, setup=None):
+    """Milliseconds per call of func over `rounds` rounds of `number` calls.
+
+    setup(), when given, runs before each round (untimed) and its result is
+    passed to func as the only argument.
+    """
+    samples = []
+    for _ in range(rounds):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        for _ in range(number):
+            func(arg) if setup else func()
+        samples.append((time.perf_counter() - start) * 1000 / number)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples),
+            "rounds": rounds, "number": number}
+
+def sample_city():
+    return game.generate_buildings(game.SCREEN_WIDTH, game.SCREEN_HEIGHT, random.Random(BENCH_SEED))
+
+def bench_generate_buildings(scale):
+    return time_case(sample_city, 1, 5 * scale)
+
+def bench_create_background(scale):
+    return time_case(lambda: game.create_background(game.SCREEN_WIDTH, game.SCREEN_HEIGHT,
+                                                    random.Random(BENCH_SEED)), 1, 5 * scale)
+
+def fresh_building():
+    """The widest building of the sample city, copied so each round starts undamaged."""
+    source = max(sample_city(), key=lambda b: b["rect"].width * b["rect"].height)
+    building = {"surf": source["surf"].copy(), "rect": source["rect"].copy()}
+    game.init_building_integrity(building)
+    return building
+
+def bench_damage_building(scale):
+    building = fresh_building()
+    rect = building["rect"]
+    rng = random.Random(BENCH_SEED)
+    # The same hit points every round, spread over the building
+    points = [(rng.uniform(rect.left, rect.right), rng.uniform(rect.top, rect.bottom)) for _ in range(10)]
+
+    def setup():
+        copy = {"surf": building["surf"].copy(), "rect": rect}
+        game.init_building_integrity(copy)
+        return copy
+
+    def hit_all(target):
+        for point in points:
+            game.damage_building(target, point, game.EXPLOSION_RADIUS)
+
+    result = time_case(hit_all, 1, 10 * scale, setup)
+    return {**result, "median_ms": result["median_ms"] / len(points), "min_ms": result["min_ms"] / len(points)}
+
+def bench_check_building_collapse(scale):
+    building = fresh_building()
+    return time_case(lambda: game.check_building_collapse(building), 1000, 5 * scale)
+
+def bench_draw_monkey(scale):
+    screen = pygame.display.get_surface()
+    pos = (game.SCREEN_WIDTH // 2, game.SCREEN_HEIGHT // 2)
+    return time_case(lambda: game.draw_monkey(screen, pos, game.MONKEY_COLORS[0], 60), 200, 5 * scale)
+
+def flying_banana():
+    """A banana a second into its flight, with a full trail."""
+    banana = game.new_banana((100, 500), 0, 45, 60)
+    for _ in range(120):
+        banana["prev_pos"][:] = banana["pos"]
+        physics.step(banana["pos"], banana["vel"], 0, game.GRAVITY)
+        banana["trail"].append(tuple(banana["pos"]))
+    return banana
+
+def bench_draw_banana(scale):
+    screen = pygame.display.get_surface()
+    banana = flying_banana()
+    return time_case(lambda: game.draw_banana(screen, banana, 0.5), 200, 5 * scale)
+
+def bench_draw_explosion(scale):
+    screen = pygame.display.get_surface()
+    pos = (game.SCREEN_WIDTH // 2, game.SCREEN_HEIGHT // 2)
+    progress = [i / 29 for i in range(30)]
+    game.get_explosion_frames()  # Pre-rendered once per session, not per draw
+
+    def draw_all():
+        for p in progress:
+            game.draw_explosion(screen, pos, p)
+
+    result = time_case(draw_all, 10, 5 * scale)
+    return {**result, "median_ms": result["median_ms"] / len(progress), "min_ms": result["min_ms"] / len(progress)}
+
+def bench_apply_comic_filter(scale):
+    screen = pygame.display.get_surface()
+    background = game.create_background(game.SCREEN_WIDTH, game.SCREEN_HEIGHT, random.Random(BENCH_SEED))
+
+    def setup():
+        screen.blit(background, (0, 0))
+
+    return time_case(lambda _: game.apply_comic_filter(screen), 20, 5 * scale, setup)
+
+class _ScriptedInput:
+    """Replaces pygame.event.get and Clock with a fixed key script and a 60 FPS clock that never sleeps."""
+
+    def __init__(self, frames, shot_every):
+        self.frames = frames
+        self.shot_every = shot_every
+        self.count = 0
+        self.rng = random.Random(BENCH_SEED)
+        key = self.key
+        # Menu: new two-player game, then both names
+        self.script = [[key(pygame.K_RETURN)], [key(pygame.K_a, "a")], [key(pygame.K_RETURN)],
+                       [key(pygame.K_b, "b")], [key(pygame.K_RETURN)]]
+
+    @staticmethod
+    def key(k, unicode=""):
+        return pygame.event.Event(pygame.KEYDOWN, key=k, unicode=unicode, mod=0)
+
+    def get(self, *args, **kwargs):
+        self.count += 1
+        if self.script:
+            return self.script.pop(0)
+        if self.count > self.frames:
+            return [pygame.event.Event(pygame.QUIT)]
+        if self.count % self.shot_every == 0:
+            aim = [self.key(self.rng.choice([pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT]))
+                   for _ in range(self.rng.randint(0, 20))]
+            return aim + [self.key(pygame.K_SPACE, " ")]
+        return []
+
+class _FixedClock:
+    def tick(self, fps=0):
+        return 1000 // game.FPS
+
+    def get_fps(self):
+        return float(game.FPS)
+
+def run_scripted_match(data_dir):
+    """Play MATCH_FRAMES frames of a two-player match through main(), with all files in data_dir."""
+    saved = {
+        (pygame.event, "get"): pygame.event.get, (pygame.time, "Clock"): pygame.time.Clock,
+        (game_storage, "DATA_DIR"): game_storage.DATA_DIR,
+        (game_storage, "SCORES_FILE"): game_storage.SCORES_FILE,
+        (game_storage, "SCORES_DB_FILE"): game_storage.SCORES_DB_FILE,
+        (game_storage, "GAME_STATE_FILE"): game_storage.GAME_STATE_FILE,
+        (game_storage, "GAME_DAMAGE_FILE"): game_storage.GAME_DAMAGE_FILE,
+        (world_cache, "WORLD_CACHE_DIR"): world_cache.WORLD_CACHE_DIR,
+        (replay, "REPLAY_FILE"): replay.REPLAY_FILE,
+    }
+    script = _ScriptedInput(MATCH_FRAMES, MATCH_SHOT_EVERY)
+    pygame.event.get = script.get
+    pygame.time.Clock = _FixedClock
+    game_storage.DATA_DIR = data_dir
+    game_storage.SCORES_FILE = os.path.join(data_dir, "scores.json")
+    game_storage.SCORES_DB_FILE = os.path.join(data_dir, "scores.db")
+    game_storage.GAME_STATE_FILE = os.path.join(data_dir, "game_state.json")
+    game_storage.GAME_DAMAGE_FILE = os.path.join(data_dir, "game_state.damage")
+    world_cache.WORLD_CACHE_DIR = os.path.join(data_dir, "worlds")
+    replay.REPLAY_FILE = os.path.join(data_dir, "replays.bin")
+    random.seed(BENCH_SEED)
+    try:
+        start = time.perf_counter()
+        game.main(BENCH_SEED)
+        elapsed = (time.perf_counter() - start) * 1000
+        shots = sum(len(m.shots) for m in replay.read_replays())
+        return elapsed, script.count, shots
+    finally:
+        for (module, name), value in saved.items():
+            setattr(module, name, value)
+
+def bench_scripted_match(scale):
+    samples = []
+    for _ in range(3 * scale):
+        with tempfile.TemporaryDirectory() as data_dir:
+            elapsed, frames, shots = run_scripted_match(data_dir)
+            # Close the score database opened in data_dir before it is removed
+            if game_storage._score_store is not None:
+                game_storage._score_store.close()
+                game_storage._score_store = None
+        samples.append(elapsed / frames)
+    # main() ends with pygame.quit(); restore the display for any later case
+    pygame.init()
+    pygame.display.set_mode((game.SCREEN_WIDTH, game.SCREEN_HEIGHT))
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples),
+            "rounds": 3 * scale, "number": frames, "shots": shots, "unit": "ms per frame"}
+
+CASES = {
+    "generate_buildings": bench_generate_buildings,
+    "create_background": bench_create_background,
+    "damage_building": bench_damage_building,
+    "check_building_collapse": bench_check_building_collapse,
+    "draw_monkey": bench_draw_monkey,
+    "draw_banana": bench_draw_banana,
+    "draw_explosion": bench_draw_explosion,
+    "apply_comic_filter": bench_apply_comic_filter,
+    "scripted_match": bench_scripted_match,
+}
+
+def compare(results, baseline, threshold):
+    """Print each case against the baseline; return the names slower than the threshold."""
+    slower = []
+    print(f"\n{'case':<24} {'baseline ms':>12} {'current ms':>12} {'change':>8}")
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            print(f"{name:<24} {'-':>12} {result['median_ms']:>12.4f} {'new':>8}")
+            continue
+        change = result["median_ms"] / base["median_ms"] - 1
+        flag = ""
+        if change > threshold:
+            slower.append(name)
+            flag = "  SLOWER"
+        print(f"{name:<24} {base['median_ms']:>12.4f} {result['median_ms']:>12.4f} {change:>+7.1%}{flag}")
+    return slower
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cases", nargs="*", metavar="case",
+                        help=f"cases to run (default: all): {', '.join(CASES)}")
+    parser.add_argument("--output", "-o", help="write results to this JSON file")
+    parser.add_argument("--baseline", "-b", help="compare with an earlier JSON result")
+    parser.add_argument("--threshold", "-t", type=float, default=0.10,
+                        help="relative slowdown that counts as a regression (default: 0.10)")
+    parser.add_argument("--scale", type=int, default=1, help="multiply the number of rounds")
+    args = parser.parse_args()
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    pygame.init()
+    pygame.display.set_mode((game.SCREEN_WIDTH, game.SCREEN_HEIGHT))
+    results = {}
+    for name in args.cases or CASES:
+        results[name] = CASES[name](args.scale)
+        r = results[name]
+        print(f"{name:<24} median {r['median_ms']:9.4f} ms  min {r['min_ms']:9.4f} ms")
+    pygame.quit()
+
+    report = {
+        "meta": {
+            "python": platform.python_version(), "pygame": pygame.version.ver, "numpy": np.__version__,
+            "platform": platform.platform(), "resolution": [game.SCREEN_WIDTH, game.SCREEN_HEIGHT],
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"saved {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        slower = compare(results, baseline, args.threshold)
+        if slower:
+            print(f"\n{len(slower)} case(s) slower than {args.threshold:.0%}: {', '.join(slower)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
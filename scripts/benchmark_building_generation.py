@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Time city generation at startup resolutions, old texture loops vs NumPy.
+
+For each resolution, builds the same city layouts with the vectorized
+paint_building_texture and with the old per-line gradient and per-window loops.
+Prints milliseconds per city. --save writes a side-by-side PNG so the
+visual style can be compared by eye.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import numpy as np
+import pygame
+import main as game
+
+RESOLUTIONS = {"720p": (1280, 720), "4k": (3840, 2160)}
+
+def legacy_texture(surf, base_color, category, is_skyscraper, rng):
+    """Original gradient and window loops from generate_buildings, kept here only for comparison."""
+    width, height = surf.get_size()
+    if category == "glass_steel":
+        for iy in range(height):
+            factor = 0.8 + (0.2 * iy / height)
+            pygame.draw.line(surf, [int(c * factor) for c in base_color], (0, iy), (width, iy))
+    else:
+        for ix in range(width):
+            factor = 0.85 + (0.15 * ix / width)
+            pygame.draw.line(surf, [int(c * factor) for c in base_color], (ix, 0), (ix, height))
+
+    window_width, window_height = (10, 18) if is_skyscraper else (8, 12)
+    window_colors = [tuple(int(v) for v in c) for c in game.WINDOW_COLORS]
+    for r in range(10, height - window_height - 10, 25):
+        for c in range(10, width - window_width - 10, 15):
+            if rng.random() < 0.7:
+                win_color = rng.choice(window_colors)
+                if category == "glass_steel" and rng.random() < 0.5:
+                    if rng.random() < 0.3:
+                        pygame.draw.rect(surf, win_color[:3] + (100,), (c, r, window_width, height - r - 10),
+                                         border_radius=1)
+                else:
+                    pygame.draw.rect(surf, win_color, (c, r, window_width, window_height), border_radius=1)
+                    if rng.random() < 0.2:
+                        pygame.draw.circle(surf, (255, 255, 255, 50), (c + 3, r + 3), 2)
+
+def city_specs(buildings):
+    """(size, color, category, skyscraper) of each building, read back from a generated city."""
+    specs = []
+    for b in buildings:
+        size = b["rect"].size
+        # The base color is not stored; the mid-height, right-edge pixel is close enough for timing
+        color = b["surf"].get_at((size[0] - 1, size[1] // 2))[:3]
+        skyscraper = size[1] >= int(b["rect"].bottom * 0.6)
+        specs.append((size, color, "glass_steel" if skyscraper else "brick", skyscraper))
+    return specs
+
+def time_textures(specs, texture, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for size, color, category, skyscraper in specs:
+            texture(size, color, category, skyscraper)
+    return (time.perf_counter() - start) / repeats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", metavar="PNG", help="write old (left) and new (right) 720p cities")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    print(f"{'size':>5} {'generate ms':>12} {'legacy tex ms':>14} {'vector tex ms':>14} {'speedup':>8}")
+    for name, (width, height) in RESOLUTIONS.items():
+        random.seed(args.seed)
+        start = time.perf_counter()
+        for _ in range(args.repeats):
+            buildings = game.generate_buildings(width, height)
+        generate_t = (time.perf_counter() - start) / args.repeats
+
+        specs = city_specs(buildings)
+        np_rng, py_rng = np.random.default_rng(args.seed), random.Random(args.seed)
+        vector_t = time_textures(specs, lambda size, *spec: game.paint_building_texture(
+            pygame.Surface(size, pygame.SRCALPHA), *spec, np_rng), args.repeats)
+        legacy_t = time_textures(specs, lambda size, *spec: legacy_texture(
+            pygame.Surface(size, pygame.SRCALPHA), *spec, py_rng), args.repeats)
+        print(f"{name:>5} {generate_t * 1000:>12.1f} {legacy_t * 1000:>14.1f} {vector_t * 1000:>14.1f} "
+              f"{legacy_t / vector_t:>7.1f}x")
+
+    if args.save:
+        width, height = RESOLUTIONS["720p"]
+        random.seed(args.seed)
+        buildings = game.generate_buildings(width, height)
+        sheet = pygame.Surface((width * 2, height))
+        sheet.fill((10, 20, 40))
+        py_rng = random.Random(args.seed)
+        for (size, color, category, skyscraper), b in zip(city_specs(buildings), buildings):
+            old = pygame.Surface(size, pygame.SRCALPHA)
+            legacy_texture(old, color, category, skyscraper, py_rng)
+            sheet.blit(old, b["rect"].topleft)
+            sheet.blit(b["surf"], b["rect"].move(width, 0).topleft)
+        pygame.image.save(sheet, args.save)
+        print(f"saved {args.save}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
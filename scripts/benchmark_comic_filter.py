@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Measure frames per second of the playing scene with the comic filter on and off."""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame
+import main as game
+
+def legacy_comic_filter(surface):
+    """Original PIL round trip, kept here only for comparison."""
+    from PIL import Image, ImageOps
+    raw_str = pygame.image.tostring(surface, "RGB")
+    pil_img = Image.frombytes("RGB", surface.get_size(), raw_str)
+    poster = ImageOps.posterize(pil_img, 3)
+    return pygame.image.fromstring(poster.tobytes(), poster.size, poster.mode)
+
+def run(screen, background, buildings, frames, mode):
+    """Render `frames` frames of the static scene and return the FPS."""
+    start = time.perf_counter()
+    for _ in range(frames):
+        screen.blit(background, (0, 0))
+        game.draw_buildings(screen, buildings)
+        if mode == "filter":
+            game.apply_comic_filter(screen)
+        elif mode == "legacy":
+            screen.blit(legacy_comic_filter(screen), (0, 0))
+        pygame.display.flip()
+    return frames / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--legacy", action="store_true", help="also time the old PIL filter")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((game.SCREEN_WIDTH, game.SCREEN_HEIGHT))
+    background = game.create_background()
+    buildings = game.generate_buildings()
+
+    modes = ["off", "filter"] + (["legacy"] if args.legacy else [])
+    for mode in modes:
+        fps = run(screen, background, buildings, args.frames, mode)
+        status = "ok" if fps >= game.FPS else "BELOW TARGET"
+        print(f"{mode:>7}: {fps:8.1f} FPS  ({status}, target {game.FPS})")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
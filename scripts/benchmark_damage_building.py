@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Compare the old per-pixel crater carving with the vectorized damage_building.
+
+Also checks that the incremental base-integrity tracker gives the same
+collapse decision as the old full scan of the building base. The exit
+status is 1 if any crater or integrity check disagrees.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame
+import main as game
+
+def legacy_carve(surf, center, radius):
+    """Original set_at loop from damage_building, kept here only for comparison."""
+    x, y = center
+    x_int, y_int = int(x), int(y)
+    radius_int = int(radius)
+    for py in range(max(0, y_int-radius_int), min(surf.get_height(), y_int+radius_int+1)):
+        for px in range(max(0, x_int-radius_int), min(surf.get_width(), x_int+radius_int+1)):
+            if math.hypot(px-x, py-y) <= radius:
+                surf.set_at((px, py), (0, 0, 0, 0))
+
+def legacy_collapse_scan(surf):
+    """Original get_at scan from check_building_collapse."""
+    width, height = surf.get_width(), surf.get_height()
+    base_check_height = min(30, height // 5)
+    base_intact_pixels = 0
+    for px in range(width):
+        for py in range(height - base_check_height, height):
+            if surf.get_at((px, py))[3] > 0:
+                base_intact_pixels += 1
+    return base_intact_pixels, base_intact_pixels / (width * base_check_height) < 0.3
+
+def check_integrity(rng, trials):
+    """Apply random damage and compare the tracker with the full scan after each hit."""
+    mismatches = 0
+    scan_t = tracker_t = 0.0
+    for _ in range(trials):
+        width, height = rng.randint(80, 200), rng.randint(150, 400)
+        building = {"surf": make_building(width, height), "rect": pygame.Rect(0, 0, width, height)}
+        for _ in range(rng.randint(1, 30)):
+            # Most hits near the base so some buildings actually collapse
+            center = (rng.uniform(-30, width + 30), rng.uniform(height * 0.6, height + 30))
+            start = time.perf_counter()
+            collapsed = game.damage_building(building, center, rng.choice([10, 25, 50]))
+            tracker_t += time.perf_counter() - start
+            start = time.perf_counter()
+            intact, expected = legacy_collapse_scan(building["surf"])
+            scan_t += time.perf_counter() - start
+            if collapsed != expected or intact != building["base_intact"]:
+                mismatches += 1
+    return mismatches, scan_t, tracker_t
+
+def make_building(width=200, height=400):
+    surf = pygame.Surface((width, height), pygame.SRCALPHA)
+    surf.fill((130, 70, 60, 255))
+    return surf
+
+def time_carves(carve, centers, radius):
+    """Carve every center on a fresh building and return seconds per impact."""
+    surf = make_building()
+    start = time.perf_counter()
+    for center in centers:
+        carve(surf, center, radius)
+    return (time.perf_counter() - start) / len(centers), surf
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--impacts", type=int, default=20)
+    parser.add_argument("--radii", type=int, nargs="+", default=[10, 25, 50, 80])
+    parser.add_argument("--integrity-trials", type=int, default=20)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    rng = random.Random(1234)
+    failures = 0
+    print(f"{'radius':>6} {'legacy ms':>10} {'vector ms':>10} {'speedup':>8}  pixels")
+    for radius in args.radii:
+        # Fractional centers, some past the edges, like real impacts
+        centers = [(rng.uniform(-20, 220), rng.uniform(-20, 420)) for _ in range(args.impacts)]
+        legacy_t, legacy_surf = time_carves(legacy_carve, centers, radius)
+        vector_t, vector_surf = time_carves(game.carve_crater, centers, radius)
+        same = pygame.image.tostring(legacy_surf, "RGBA") == pygame.image.tostring(vector_surf, "RGBA")
+        failures += not same
+        print(f"{radius:>6} {legacy_t * 1000:>10.3f} {vector_t * 1000:>10.3f} "
+              f"{legacy_t / vector_t:>7.1f}x  {'identical' if same else 'MISMATCH'}")
+
+    mismatches, scan_t, tracker_t = check_integrity(rng, args.integrity_trials)
+    print(f"integrity: {mismatches} mismatches vs full scan "
+          f"(damage+check {tracker_t * 1000:.1f} ms, legacy scans {scan_t * 1000:.1f} ms)")
+    pygame.quit()
+    return 1 if failures or mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
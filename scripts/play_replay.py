@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Watch or verify recorded matches from data/replays.bin.
+
+A replay holds only the city seed and each shot's inputs, so matches are
+rebuilt from scratch: the city comes from the seed and every shot goes
+through the headless simulation. --speed 0 re-simulates at full speed
+without a window and prints each shot; --speed 1/4/16 renders the match.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+SPEEDS = (0, 1, 4, 16)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--file", help="replay file (default: data/replays.bin)")
+    parser.add_argument("--match", type=int, default=-1, help="match index, negative counts from the end")
+    parser.add_argument("--all", action="store_true", help="re-simulate every match (implies --speed 0)")
+    parser.add_argument("--list", action="store_true", help="list recorded matches and exit")
+    parser.add_argument("--speed", type=int, choices=SPEEDS, default=0,
+                        help="0 = headless at full speed, otherwise playback speed")
+    return parser.parse_args()
+
+def load_match_world(game, match):
+    """Buildings and gorilla positions of the match's city, plus simulation rules for its size."""
+    import simulation
+    if match.generator_version != game.WORLD_GENERATOR_VERSION:
+        print(f"warning: match {match.id:08x} was recorded with city generator "
+              f"v{match.generator_version}, this build has v{game.WORLD_GENERATOR_VERSION}")
+    background, buildings = game.build_world(match.seed, *match.size)
+    player_pos = game.place_players(buildings)
+    rules = game.SIM_RULES._replace(width=match.size[0], height=match.size[1])
+    world = simulation.make_world(buildings, player_pos, rules, copy=True)
+    return background, buildings, player_pos, rules, world
+
+def describe(index, step):
+    shot, result = step.shot, step.result
+    line = (f"  {index + 1:3d}. P{shot.turn + 1} angle {shot.angle:3d} power {shot.power:3d} "
+            f"wind {shot.wind:+3d} gravity {shot.gravity:4d} -> {result.kind:8s} "
+            f"({result.x:6.1f}, {result.y:6.1f}) health {step.health[0]}/{step.health[1]}")
+    if step.collapsed:
+        line += " collapse"
+    return line
+
+def resimulate(game, replay, match, verbose=True):
+    """Re-simulate a match headlessly; returns (winner, seconds)."""
+    _, _, _, rules, world = load_match_world(game, match)
+    start = time.perf_counter()
+    steps = list(replay.resimulate(match, world, rules, game.REPLAY_RULES))
+    elapsed = time.perf_counter() - start
+    if verbose:
+        for i, step in enumerate(steps):
+            print(describe(i, step))
+    return (steps[-1].winner if steps else None), elapsed
+
+def render(game, replay, match, speed):
+    """Play a match back in a window at `speed` times real time."""
+    import pygame
+    import physics
+    from renderer import DirtyRenderer
+
+    screen = pygame.display.set_mode(match.size)
+    pygame.display.set_caption(f"Replay {match.names[0]} x {match.names[1]} ({speed}x)")
+    font = pygame.font.SysFont(None, 28)
+    clock = pygame.time.Clock()
+    background, buildings, player_pos, rules, world = load_match_world(game, match)
+    renderer = DirtyRenderer(screen, game.COMIC_FILTER)
+    renderer.set_static(game.compose_world(background, buildings))
+    health = (game.MAX_GORILLA_HEALTH, game.MAX_GORILLA_HEALTH)
+    # Without a step limit, 16x keeps its pace instead of dropping time
+    stepper = physics.FixedStepper(max_steps=10 ** 6)
+
+    def frame(index, banana=None, explosion=None):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                return False
+        renderer.begin_frame()
+        renderer.mark(game.draw_monkey(screen, player_pos[0], game.MONKEY_COLORS[0], health[0]))
+        renderer.mark(game.draw_monkey(screen, player_pos[1], game.MONKEY_COLORS[1], health[1], facing=-1))
+        if banana:
+            renderer.mark(game.draw_banana(screen, banana, stepper.alpha))
+        if explosion:
+            renderer.mark(game.draw_explosion(screen, *explosion))
+        text = f"{match.names[0]} x {match.names[1]}  shot {index + 1}/{len(match.shots)}  {speed}x"
+        renderer.blit(game.TEXT_CACHE.render(font, text, (255, 255, 255)), (10, 10))
+        renderer.present()
+        return True
+
+    for index, step in enumerate(replay.resimulate(match, world, rules, game.REPLAY_RULES)):
+        shot, result = step.shot, step.result
+        banana = game.new_banana(player_pos[shot.turn], shot.turn, shot.angle, shot.power)
+        stepper.reset()
+        remaining = result.steps
+        while remaining > 0:
+            for _ in range(min(stepper.advance(clock.tick(game.FPS) / 1000.0 * speed), remaining)):
+                banana["prev_pos"][:] = banana["pos"]
+                physics.step(banana["pos"], banana["vel"], shot.wind * rules.wind_factor, shot.gravity)
+                banana["trail"].append((banana["pos"][0], banana["pos"][1]))
+                remaining -= 1
+            if not frame(index, banana):
+                return
+
+        if result.kind == "building":
+            b = buildings[result.building]
+            game.damage_building(b, (result.x, result.y), rules.explosion_radius)
+            radius = rules.explosion_radius
+            area = pygame.Rect(int(result.x) - radius, int(result.y) - radius, radius * 2 + 1, radius * 2 + 1)
+            if step.collapsed:
+                b["collapsed"] = True
+                area = area.union(b["rect"])
+            renderer.update_static(game.recompose_world_area(renderer.static, background, buildings, area))
+        health = step.health
+        if result.kind in ("building", "gorilla"):
+            elapsed = 0.0
+            while elapsed < game.EXPLOSION_DURATION:
+                elapsed += clock.tick(game.FPS) / 1000.0 * speed
+                if not frame(index, explosion=((result.x, result.y), min(elapsed / game.EXPLOSION_DURATION, 1.0))):
+                    return
+    # Hold the final frame briefly
+    end = time.perf_counter() + 1.0
+    while time.perf_counter() < end and frame(len(match.shots) - 1):
+        clock.tick(game.FPS)
+
+def main():
+    args = parse_args()
+    if args.speed == 0 or args.all or args.list:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    import pygame
+    import replay
+    import main as game
+
+    matches = replay.read_replays(args.file)
+    if not matches:
+        print("no recorded matches")
+        return 1
+    if args.list:
+        for i, m in enumerate(matches):
+            winner = m.names[m.winner] if m.winner is not None else "-"
+            print(f"{i:4d}  {m.id:08x}  seed {m.seed:<10d} {m.names[0]} x {m.names[1]}  "
+                  f"{len(m.shots)} shots  winner {winner}")
+        return 0
+
+    pygame.init()
+    if args.all or args.speed == 0:
+        pygame.display.set_mode((1, 1))
+        selected = matches if args.all else [matches[args.match]]
+        mismatches = 0
+        for m in selected:
+            print(f"match {m.id:08x} seed {m.seed} {m.names[0]} x {m.names[1]}")
+            winner, elapsed = resimulate(game, replay, m, verbose=not args.all)
+            recorded = m.names[m.winner] if m.winner is not None else "unfinished"
+            result = m.names[winner] if winner is not None else "unfinished"
+            ok = winner == m.winner
+            mismatches += not ok
+            print(f"  {len(m.shots)} shots in {elapsed * 1000:.1f} ms: {result} "
+                  f"(recorded: {recorded}){'' if ok else '  MISMATCH'}")
+        pygame.quit()
+        return 1 if mismatches else 0
+
+    render(game, replay, matches[args.match], args.speed)
+    pygame.quit()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+import random
+import time
+from collections import OrderedDict, namedtuple
+import numpy as np
+
+import simulation
+import solver
+
+# Nível de dificuldade: passos da grade de busca, refinamento e erro de mira
+Difficulty = namedtuple("Difficulty", [
+    "label", "angle_step", "power_step", "refine", "angle_noise", "power_noise"])
+
+DIFFICULTIES = {
+    "facil": Difficulty("Fácil", 6, 8, False, 6.0, 8.0),
+    "medio": Difficulty("Médio", 3, 4, False, 2.0, 3.0),
+    "dificil": Difficulty("Difícil", 2, 2, True, 0.0, 0.0),
+}
+DIFFICULTY_ORDER = ["facil", "medio", "dificil"]
+
+# Faixas de busca (ângulo em graus, potência 0-100)
+AI_ANGLE_RANGE = (5, 85)
+AI_POWER_RANGE = (10, 100)
+# Passos de física simulados (para a grade inteira) por fatia do gerador de busca
+AI_STEPS_PER_SLICE = 24
+AI_CACHE_SIZE = 64
+
+def _score(hit_map, target):
+    """Distância do impacto ao alvo (0 se acertou, infinito se acertou a si mesmo)"""
+    dist = np.hypot(hit_map.x - target[0], hit_map.y - target[1])
+    dist = np.where(hit_map.kind == solver.HIT_TARGET, 0.0, dist)
+    return np.where(hit_map.kind == solver.HIT_SELF, np.inf, dist)
+
+class ComputerPlayer:
+    """
+    Oponente controlado pelo computador.
+
+    Escolhe ângulo e potência buscando trajetórias simuladas contra o
+    horizonte e o vento atuais. A busca é um gerador que avança alguns
+    passos da simulação da grade por chamada; plan() a executa inteira,
+    fora da thread do jogo, podendo ser cancelada entre as fatias. O
+    resultado fica em cache por (versão do mundo, vento, gravidade, jogador).
+    """
+
+    def __init__(self, difficulty="medio", rng=None):
+        self.difficulty = difficulty
+        self.level = DIFFICULTIES[difficulty]
+        self.rng = rng or random.Random()
+        self.cache = OrderedDict()
+
+    @property
+    def label(self):
+        return self.level.label
+
+    def think(self, buildings, player_pos, world_version, wind, gravity, shooter, rules):
+        """
+        Gerador da jogada: produz None enquanto pensa e, por fim, (ângulo, potência).
+        """
+        key = (world_version, wind, gravity, shooter, self.difficulty)
+        best = self.cache.get(key)
+        if best is None:
+            world = simulation.make_world(buildings, player_pos, rules)
+            yield None
+            search = self._search(world, wind, gravity, shooter, rules)
+            for best in search:
+                if best is None:
+                    yield None
+            self.cache[key] = best
+            if len(self.cache) > AI_CACHE_SIZE:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(key)
+        yield self._aim(best)
+
+    def plan(self, buildings, player_pos, world_version, wind, gravity, shooter, rules, cancel=None):
+        """
+        Executa think() até o fim (para rodar numa thread de trabalho).
+
+        cancel é um threading.Event consultado entre as fatias da busca;
+        se for sinalizado, a busca é abandonada e o retorno é None.
+        """
+        for choice in self.think(buildings, player_pos, world_version, wind, gravity, shooter, rules):
+            if cancel is not None and cancel.is_set():
+                return None
+            if choice is not None:
+                return choice
+            # Ceder o GIL entre as fatias, para não atrasar os quadros do jogo
+            time.sleep(0)
+
+    def _search(self, world, wind, gravity, shooter, rules):
+        """Busca em grade (e refinamento opcional) do melhor (ângulo, potência)"""
+        level = self.level
+        target = world["player_pos"][1 - shooter]
+        angles = np.arange(AI_ANGLE_RANGE[0], AI_ANGLE_RANGE[1] + 1, level.angle_step, dtype=np.float64)
+        powers = np.arange(AI_POWER_RANGE[0], AI_POWER_RANGE[1] + 1, level.power_step, dtype=np.float64)
+        best, best_score = yield from self._evaluate(world, wind, gravity, shooter, rules,
+                                                     angles, powers, target, (45.0, 50.0), np.inf)
+
+        if level.refine and best_score > 0:
+            # Grade de passo 1 ao redor do melhor ponto encontrado
+            angles = np.arange(max(AI_ANGLE_RANGE[0], best[0] - level.angle_step),
+                               min(AI_ANGLE_RANGE[1], best[0] + level.angle_step) + 1)
+            powers = np.arange(max(AI_POWER_RANGE[0], best[1] - level.power_step),
+                               min(AI_POWER_RANGE[1], best[1] + level.power_step) + 1)
+            best, best_score = yield from self._evaluate(world, wind, gravity, shooter, rules,
+                                                         angles, powers, target, best, best_score)
+        yield best
+
+    def _evaluate(self, world, wind, gravity, shooter, rules, angles, powers, target, best, best_score):
+        """Simula uma grade em fatias e devolve o melhor ponto (ou o anterior)"""
+        for hit_map in solver.iter_hit_map(world, wind, gravity, shooter, angles, powers,
+                                           rules, steps_per_yield=AI_STEPS_PER_SLICE):
+            if hit_map is None:
+                yield None
+                continue
+            scores = _score(hit_map, target)
+            i, j = np.unravel_index(np.argmin(scores), scores.shape)
+            if scores[i, j] < best_score:
+                best, best_score = (hit_map.angles[i], hit_map.powers[j]), scores[i, j]
+        return best, best_score
+
+    def _aim(self, best):
+        """Aplica o erro de mira do nível e arredonda para os controles do jogo"""
+        angle = best[0] + self.rng.gauss(0, self.level.angle_noise) if self.level.angle_noise else best[0]
+        power = best[1] + self.rng.gauss(0, self.level.power_noise) if self.level.power_noise else best[1]
+        return (int(round(min(max(angle, 0), 180))),
+                int(round(min(max(power, 0), 100))))
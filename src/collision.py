@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+import math
+from collections import namedtuple
+import numpy as np
+
+# Resultado de uma varredura: t em [0, 1] ao longo do segmento percorrido
+# kind é "building" (index = índice do prédio) ou "gorilla" (index = jogador)
+Hit = namedtuple("Hit", ["t", "x", "y", "kind", "index"])
+
+# Espaçamento máximo (em pixels) entre amostras ao testar a máscara de pixels
+MASK_SAMPLE_SPACING = 0.5
+
+def segment_rect_toi(p0, p1, rect):
+    """
+    Intervalo (t_enter, t_exit) em que o segmento p0->p1 está dentro do retângulo
+    (recorte de Liang-Barsky), ou None se não há interseção.
+    """
+    t_enter, t_exit = 0.0, 1.0
+    dx, dy = p1[0] - p0[0], p1[1] - p0[1]
+    for delta, start, low, high in ((dx, p0[0], rect[0], rect[0] + rect[2]),
+                                    (dy, p0[1], rect[1], rect[1] + rect[3])):
+        if delta == 0:
+            if start < low or start >= high:
+                return None
+            continue
+        t0, t1 = (low - start) / delta, (high - start) / delta
+        if t0 > t1:
+            t0, t1 = t1, t0
+        t_enter, t_exit = max(t_enter, t0), min(t_exit, t1)
+        if t_enter > t_exit:
+            return None
+    return t_enter, t_exit
+
+def segment_circle_toi(p0, p1, center, radius):
+    """Primeiro t em que o segmento p0->p1 entra no círculo, ou None"""
+    fx, fy = p0[0] - center[0], p0[1] - center[1]
+    c = fx * fx + fy * fy - radius * radius
+    if c <= 0:
+        return 0.0  # Já começa dentro do círculo
+    dx, dy = p1[0] - p0[0], p1[1] - p0[1]
+    a = dx * dx + dy * dy
+    b = 2 * (fx * dx + fy * dy)
+    disc = b * b - 4 * a * c
+    if a == 0 or disc < 0:
+        return None
+    t = (-b - math.sqrt(disc)) / (2 * a)
+    return t if 0.0 <= t <= 1.0 else None
+
+def segment_mask_toi(p0, p1, rect, solid, span=None):
+    """
+    Primeiro t em que o segmento toca um pixel sólido do prédio.
+
+    solid é uma matriz booleana indexada [x, y] nas coordenadas do prédio
+    (pixels com alfa > 0). span é o intervalo já recortado pelo retângulo.
+    """
+    if span is None:
+        span = segment_rect_toi(p0, p1, rect)
+        if span is None:
+            return None
+    t_enter, t_exit = span
+    length = math.hypot(p1[0] - p0[0], p1[1] - p0[1]) * (t_exit - t_enter)
+    samples = int(length / MASK_SAMPLE_SPACING) + 2
+    ts = np.linspace(t_enter, t_exit, samples)
+    xs = np.floor(p0[0] + (p1[0] - p0[0]) * ts).astype(np.intp) - rect[0]
+    ys = np.floor(p0[1] + (p1[1] - p0[1]) * ts).astype(np.intp) - rect[1]
+    np.clip(xs, 0, solid.shape[0] - 1, out=xs)
+    np.clip(ys, 0, solid.shape[1] - 1, out=ys)
+    hits = np.flatnonzero(solid[xs, ys])
+    if hits.size == 0:
+        return None
+    return float(ts[hits[0]])
+
+def sweep(p0, p1, buildings, gorillas, gorilla_radius, skyline=None):
+    """
+    Colisão contínua do segmento percorrido em um passo.
+
+    Args:
+        p0, p1: Posições no início e no fim do passo
+        buildings: Prédios com "rect" e, opcionalmente, "solid" (máscara de
+            pixels); sem máscara, o retângulo inteiro conta como sólido
+        gorillas: Pares (índice do jogador, centro) que podem ser atingidos
+        gorilla_radius: Raio de colisão (banana + gorila)
+        skyline: Índice do horizonte (Skyline) opcional; com ele só os
+            prédios sob o segmento são testados
+
+    Returns:
+        O Hit mais cedo ao longo do segmento, ou None
+    """
+    best = None
+    if skyline is None:
+        indices = range(len(buildings))
+    elif skyline.segment_above(p0, p1):
+        indices = ()
+    else:
+        indices = skyline.candidates(p0[0], p1[0])
+    for i in indices:
+        b = buildings[i]
+        rect = b["rect"]
+        span = segment_rect_toi(p0, p1, rect)
+        if span is None or (best and span[0] >= best.t):
+            continue
+        solid = b.get("solid")
+        t = span[0] if solid is None else segment_mask_toi(p0, p1, rect, solid, span)
+        if t is not None and (best is None or t < best.t):
+            best = Hit(t, 0, 0, "building", i)
+
+    for player_idx, center in gorillas:
+        t = segment_circle_toi(p0, p1, center, gorilla_radius)
+        if t is not None and (best is None or t < best.t):
+            best = Hit(t, 0, 0, "gorilla", player_idx)
+
+    if best is None:
+        return None
+    return best._replace(x=p0[0] + (p1[0] - p0[0]) * best.t,
+                         y=p0[1] + (p1[1] - p0[1]) * best.t)
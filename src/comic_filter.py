@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+import numpy as np
+import pygame
+
+# Bits mantidos por canal (equivalente a ImageOps.posterize(img, 3))
+POSTERIZE_BITS = 3
+
+class ComicFilter:
+    """
+    Filtro de quadrinhos (posterização) aplicado no próprio buffer de pixels.
+
+    Em vez de copiar o quadro para o PIL e de volta, zera os bits menos
+    significativos de cada canal com uma máscara de bits diretamente na
+    superfície (via pygame.surfarray), sem alocar superfícies por quadro.
+    """
+
+    def __init__(self, bits=POSTERIZE_BITS):
+        self.bits = bits
+        # Máscara por canal: 3 bits -> 0b11100000
+        self.channel_mask = np.uint8((0xFF << (8 - bits)) & 0xFF)
+        # Máscara por pixel (32 bits), recalculada só se o formato mudar
+        self._pixel_mask = None
+        self._pixel_format = None
+
+    def _mask_for(self, surface):
+        """Retorna a máscara de 32 bits para o formato de pixel da superfície"""
+        pixel_format = (surface.get_masks(), surface.get_shifts())
+        if pixel_format != self._pixel_format:
+            masks, shifts = pixel_format
+            keep = masks[3]  # O canal alfa nunca é posterizado
+            for mask, shift in zip(masks[:3], shifts[:3]):
+                keep |= (int(self.channel_mask) << shift) & mask
+            self._pixel_mask = np.uint32(keep)
+            self._pixel_format = pixel_format
+        return self._pixel_mask
+
+    def apply(self, surface):
+        """Posteriza a superfície no lugar e a retorna"""
+        if surface.get_bytesize() == 4:
+            pixels = pygame.surfarray.pixels2d(surface)
+            mask = self._mask_for(surface)
+        else:
+            pixels = pygame.surfarray.pixels3d(surface)
+            mask = self.channel_mask
+        np.bitwise_and(pixels, mask, out=pixels)
+        # Liberar a referência ao buffer para destravar a superfície
+        del pixels
+        return surface
+
+    def apply_rects(self, surface, rects):
+        """Posteriza só as áreas indicadas (retângulos em coordenadas da superfície)"""
+        bounds = surface.get_rect()
+        if surface.get_bytesize() == 4:
+            pixels = pygame.surfarray.pixels2d(surface)
+            mask = self._mask_for(surface)
+        else:
+            pixels = pygame.surfarray.pixels3d(surface)
+            mask = self.channel_mask
+        for rect in rects:
+            rect = bounds.clip(rect)
+            if rect.width and rect.height:
+                area = pixels[rect.left:rect.right, rect.top:rect.bottom]
+                np.bitwise_and(area, mask, out=area)
+        del pixels
+        return surface
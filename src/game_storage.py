@@ -1,62 +1,261 @@
 #!/usr/bin/env python3
 import os
+import sys
 import json
+import struct
+import zlib
+import atexit
 import datetime
+import threading
+import numpy as np
+
+from score_store import ScoreStore, TOP_SCORES
 
 # Caminho para o arquivo de dados
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+# Recordes antigos (JSON), importados uma vez para o banco de pontuações
 SCORES_FILE = os.path.join(DATA_DIR, "scores.json")
+SCORES_DB_FILE = os.path.join(DATA_DIR, "scores.db")
 GAME_STATE_FILE = os.path.join(DATA_DIR, "game_state.json")
+# Máscaras de dano dos prédios do jogo salvo (arquivo binário ao lado do JSON)
+GAME_DAMAGE_FILE = os.path.join(DATA_DIR, "game_state.damage")
+
+# Formato do arquivo de dano: cabeçalho, tamanho de cada máscara e um bloco
+# zlib com as máscaras empacotadas em bits (np.packbits), em little-endian
+_DAMAGE_MAGIC = b"GDMG"
+_DAMAGE_VERSION = 1
+_DAMAGE_HEADER = struct.Struct("<4sIqI")  # magic, versão, semente, prédios
+_DAMAGE_SIZE = struct.Struct("<II")       # largura, altura
+
+# JSON compacto (sem indentação nem espaços)
+_JSON_SEPARATORS = (",", ":")
 
 def ensure_data_dir_exists():
     """Garante que o diretório de dados exista"""
     if not os.path.exists(DATA_DIR):
         os.makedirs(DATA_DIR)
 
+def atomic_write(path, data):
+    """
+    Grava os bytes de forma segura contra falhas: escreve num arquivo
+    temporário, força para o disco (fsync) e só então o troca pelo
+    destino com os.replace. O arquivo antigo continua íntegro até a troca.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def append_file(path, data, header=b""):
+    """Acrescenta os bytes ao fim do arquivo; header abre um arquivo novo (ou vazio)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'ab') as f:
+        if f.tell() == 0:
+            f.write(header)
+        f.write(data)
+
+class AsyncWriter:
+    """
+    Gravação de arquivos numa thread de fundo.
+
+    Cada pedido é (caminho, bytes), ou (caminho, None) para apagar, e pode
+    trazer uma função chamada na thread de fundo depois da gravação. Pedidos
+    para o mesmo caminho ainda não gravados são fundidos: só o último
+    vai para o disco. Acréscimos (append) não se substituem: os bytes
+    pendentes de um arquivo se juntam, na ordem, e vão para o seu fim.
+    Leituras com read() enxergam as gravações que ainda estão na fila ou
+    em andamento. Falhas de gravação ficam em errors até serem
+    retiradas com take_errors().
+    """
+
+    def __init__(self):
+        self._queue = {}    # caminho -> (bytes ou None para apagar, then), em ordem de chegada
+        self._appends = {}  # caminho -> (cabeçalho, bytearray com os acréscimos pendentes)
+        self._inflight = None  # (caminho, bytes ou None, acréscimo?) sendo gravado agora
+        self._busy = False
+        self._cond = threading.Condition()
+        self._thread = None
+        self.errors = []
+
+    def submit(self, path, data, then=None):
+        """
+        Enfileira a gravação (ou remoção, com data=None) de um arquivo;
+        then(), se dado, roda depois que o arquivo for gravado
+        """
+        with self._cond:
+            self._queue.pop(path, None)
+            self._queue[path] = (data, then)
+            self._wake()
+
+    def append(self, path, data, header=b""):
+        """Enfileira bytes para o fim do arquivo (header se o arquivo for novo)"""
+        with self._cond:
+            if path not in self._appends:
+                self._appends[path] = (header, bytearray())
+            self._appends[path][1].extend(data)
+            self._wake()
+
+    def _wake(self):
+        # Chamado com self._cond adquirido
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="storage-writer", daemon=True)
+            self._thread.start()
+        self._cond.notify_all()
+
+    def read(self, path):
+        """
+        Conteúdo do arquivo considerando gravações na fila ou em andamento e
+        acréscimos ainda não escritos (None se não existe).
+
+        O disco é lido com a trava adquirida, então a thread de fundo não
+        termina nenhuma gravação no meio da leitura.
+        """
+        with self._cond:
+            # Um acréscimo em andamento é curto (sem fsync): esperar terminar
+            # para não ler o arquivo pela metade
+            self._cond.wait_for(lambda: self._inflight is None or self._inflight[0] != path
+                                or not self._inflight[2])
+            if path in self._queue:
+                data = self._queue[path][0]
+            elif self._inflight is not None and self._inflight[0] == path:
+                data = self._inflight[1]
+            else:
+                try:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                except OSError:
+                    data = None
+            appended = self._appends.get(path)
+            if appended is not None:
+                # Como append_file: o cabeçalho só entra num arquivo novo ou vazio
+                header, extra = appended
+                data = (data or header) + bytes(extra)
+            return data
+
+    def flush(self, timeout=None):
+        """Espera a fila esvaziar; retorna False se o tempo acabar antes"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._appends and not self._busy,
+                                       timeout)
+
+    def take_errors(self):
+        """Retorna e esquece as falhas de gravação [(caminho, OSError)] até agora"""
+        with self._cond:
+            errors, self.errors = self.errors, []
+        return errors
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._appends)
+                header = None
+                if self._queue:
+                    path = next(iter(self._queue))
+                    data, then = self._queue.pop(path)
+                else:
+                    path = next(iter(self._appends))
+                    header, data = self._appends.pop(path)
+                    then = None
+                # Visível em read() até o arquivo estar no lugar
+                self._inflight = (path, data, header is not None)
+                self._busy = True
+            try:
+                if header is not None:
+                    append_file(path, bytes(data), header)
+                elif data is None:
+                    if os.path.exists(path):
+                        os.remove(path)
+                else:
+                    atomic_write(path, data)
+                if then is not None:
+                    then()
+            except OSError as e:
+                with self._cond:
+                    self.errors.append((path, e))
+            finally:
+                with self._cond:
+                    self._inflight = None
+                    self._busy = False
+                    self._cond.notify_all()
+
+# Gravador compartilhado por todo o armazenamento do jogo
+_writer = AsyncWriter()
+
+def write_async(path, data, then=None):
+    """
+    Grava os bytes no caminho em segundo plano (seguro contra falhas).
+    then(), se dado, roda na thread de fundo depois da gravação.
+    """
+    _writer.submit(path, data, then)
+
+def append_async(path, data, header=b""):
+    """Acrescenta os bytes ao fim do arquivo em segundo plano (header se for novo)"""
+    _writer.append(path, data, header)
+
+def flush(timeout=None):
+    """
+    Espera todas as gravações pendentes terminarem (chamar ao sair do jogo)
+    e informa no stderr as que falharam.
+
+    Returns:
+        True se tudo foi gravado; False se o tempo acabou ou houve falhas
+    """
+    done = _writer.flush(timeout)
+    if not done:
+        print("Gravações ainda pendentes ao sair; podem ter se perdido", file=sys.stderr)
+    errors = _writer.take_errors()
+    for path, error in errors:
+        print(f"Falha ao gravar {path}: {error}", file=sys.stderr)
+    return done and not errors
+
+atexit.register(flush)
+
+def read_bytes(path):
+    """Conteúdo atual do arquivo, considerando gravações ainda não terminadas (None se não existe)"""
+    return _writer.read(path)
+
+def _dump_json(value):
+    return json.dumps(value, separators=_JSON_SEPARATORS).encode("utf-8")
+
+# Banco de pontuações aberto (reaberto se SCORES_DB_FILE mudar)
+_score_store = None
+
+def get_score_store():
+    """Banco de pontuações, aberto e migrado do scores.json no primeiro uso"""
+    global _score_store
+    if _score_store is None or _score_store.path != SCORES_DB_FILE:
+        if _score_store is not None:
+            _score_store.close()
+        _score_store = ScoreStore(SCORES_DB_FILE)
+        _score_store.migrate_json(SCORES_FILE)
+    return _score_store
+
 def save_high_scores(players_scores):
     """
-    Salva as pontuações dos jogadores no arquivo de pontuação.
+    Registra as pontuações dos jogadores no histórico.
     
     Args:
         players_scores: Lista de dicionários com pontuações dos jogadores
         [{'name': 'Player1', 'score': 5}, {'name': 'Player2', 'score': 3}]
+
+    Returns:
+        Os recordes atualizados (top 10)
     """
-    ensure_data_dir_exists()
-    
-    # Carregar scores existentes
-    existing_scores = load_high_scores()
-    
-    # Adicionar novos scores
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    for player in players_scores:
-        player['timestamp'] = timestamp
-        existing_scores.append(player)
-    
-    # Ordenar por pontuação (do maior para o menor)
-    existing_scores.sort(key=lambda x: x['score'], reverse=True)
-    
-    # Manter apenas os top 10 scores
-    top_scores = existing_scores[:10]
-    
-    # Salvar no arquivo
-    with open(SCORES_FILE, 'w') as f:
-        json.dump(top_scores, f, indent=2)
-    
-    return top_scores
+    store = get_score_store()
+    store.add_scores(players_scores)
+    return store.top(TOP_SCORES)
 
 def load_high_scores():
-    """Carrega as pontuações salvas do arquivo"""
-    ensure_data_dir_exists()
-    
-    if not os.path.exists(SCORES_FILE):
-        return []
-    
-    try:
-        with open(SCORES_FILE, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        # Se o arquivo estiver corrompido ou não existir, retorna uma lista vazia
-        return []
+    """Retorna os recordes (top 10), da memória quando não houve partida nova"""
+    return get_score_store().top(TOP_SCORES)
+
+def load_player_scores(name):
+    """Melhores pontuações e estatísticas de um jogador"""
+    store = get_score_store()
+    return store.player_scores(name), store.player_stats(name)
 
 def save_game_state(state):
     """
@@ -77,24 +276,69 @@ def save_game_state(state):
     # Adicionar timestamp
     state['timestamp'] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    with open(GAME_STATE_FILE, 'w') as f:
-        json.dump(state, f, indent=2)
+    write_async(GAME_STATE_FILE, _dump_json(state))
 
 def load_game_state():
     """Carrega o estado salvo do jogo"""
     ensure_data_dir_exists()
     
-    if not os.path.exists(GAME_STATE_FILE):
+    data = read_bytes(GAME_STATE_FILE)
+    if data is None:
         return None
     
     try:
-        with open(GAME_STATE_FILE, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        # Se o arquivo estiver corrompido ou não existir, retorna None
+        return json.loads(data)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        # Se o arquivo estiver corrompido, retorna None
         return None
 
+def save_damage_masks(seed, masks):
+    """
+    Salva as máscaras de pixels sólidos dos prédios do jogo em andamento.
+
+    Args:
+        seed: Semente do cenário (as máscaras só valem para ele)
+        masks: Lista de matrizes booleanas [x, y], uma por prédio
+    """
+    ensure_data_dir_exists()
+    header = _DAMAGE_HEADER.pack(_DAMAGE_MAGIC, _DAMAGE_VERSION, seed, len(masks))
+    sizes = b"".join(_DAMAGE_SIZE.pack(*mask.shape) for mask in masks)
+    bits = b"".join(np.packbits(mask, axis=None).tobytes() for mask in masks)
+    write_async(GAME_DAMAGE_FILE, header + sizes + zlib.compress(bits))
+
+def load_damage_masks(seed):
+    """
+    Carrega as máscaras salvas por save_damage_masks.
+
+    Returns:
+        Lista de matrizes booleanas [x, y], ou None se o arquivo não existir,
+        estiver corrompido ou for de outra semente
+    """
+    data = read_bytes(GAME_DAMAGE_FILE)
+    if data is None:
+        return None
+    try:
+        magic, version, file_seed, count = _DAMAGE_HEADER.unpack_from(data)
+        if (magic, version, file_seed) != (_DAMAGE_MAGIC, _DAMAGE_VERSION, seed):
+            return None
+        offset = _DAMAGE_HEADER.size
+        sizes = [_DAMAGE_SIZE.unpack_from(data, offset + i * _DAMAGE_SIZE.size) for i in range(count)]
+        bits = np.frombuffer(zlib.decompress(data[offset + count * _DAMAGE_SIZE.size:]), dtype=np.uint8)
+    except (struct.error, zlib.error):
+        return None
+
+    masks = []
+    start = 0
+    for width, height in sizes:
+        length = (width * height + 7) // 8
+        if start + length > bits.size:
+            return None
+        mask = np.unpackbits(bits[start:start + length], count=width * height).astype(bool)
+        masks.append(mask.reshape(width, height))
+        start += length
+    return masks
+
 def delete_game_state():
-    """Remove o arquivo de estado do jogo"""
-    if os.path.exists(GAME_STATE_FILE):
-        os.remove(GAME_STATE_FILE)
+    """Remove o arquivo de estado do jogo (na ordem das gravações pendentes)"""
+    write_async(GAME_STATE_FILE, None)
+    write_async(GAME_DAMAGE_FILE, None)
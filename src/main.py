@@ -1,14 +1,31 @@
 #!/usr/bin/env python3
 import sys
+import argparse
 import math
 import random
+import functools
+import threading
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pygame
 import os
-import time
-from PIL import Image, ImageOps
 
 # Importar módulo de armazenamento
 import game_storage
+import world_cache
+import physics
+import collision
+import simulation
+import replay
+from ai import ComputerPlayer, DIFFICULTIES, DIFFICULTY_ORDER
+from simulation import crater_box
+from skyline import Skyline
+from comic_filter import ComicFilter
+from renderer import DirtyRenderer
+from scene import Scene, SceneMachine
+from text_cache import TextCache
+from profiler import FrameProfiler
 
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
@@ -44,10 +61,122 @@ EXPLOSION_COLORS = [
     (255, 0, 0),      # Vermelho
 ]
 
-def generate_buildings():
-    """Gera prédios para um cenário urbano no estilo de Nova York."""
+# Regras para a simulação sem tela (IA, replays), espelhando as constantes acima
+SIM_RULES = simulation.Rules(
+    width=SCREEN_WIDTH, height=SCREEN_HEIGHT,
+    wind_factor=WIND_FACTOR, vel_factor=VEL_FACTOR,
+    banana_radius=BANANA_RADIUS, monkey_radius=MONKEY_RADIUS,
+    explosion_radius=EXPLOSION_RADIUS,
+    self_hit_delay=0.5, max_time=30.0,
+)
+
+# Dano e energia para recalcular partidas gravadas, espelhando o loop do jogo
+REPLAY_RULES = replay.MatchRules(
+    max_health=MAX_GORILLA_HEALTH, hit_damage=DAMAGE_PER_HIT,
+    self_hit_damage=int(DAMAGE_PER_HIT * 1.5), collapse_damage=DAMAGE_BUILDING_COLLAPSE,
+)
+
+# Janelas dos prédios (RGBA; o alfa é gravado direto na textura)
+WINDOW_COLORS = np.array([
+    (255, 240, 180, 200),  # Luz amarela (com alfa)
+    (230, 230, 220, 200),  # Luz branca (com alfa)
+    (50, 50, 60, 150),     # Janela escura/reflexo (com alfa)
+    (20, 20, 30, 220),     # Janela bem escura (com alfa)
+], dtype=np.uint32)
+WINDOW_SPACING_X, WINDOW_SPACING_Y = 15, 25
+WINDOW_MARGIN = 10
+WINDOW_STRIP_ALPHA = 100
+WINDOW_GLINT_COLOR = (255, 255, 255, 50)
+# Pequeno brilho: disco de raio 2 em (3, 3) dentro da janela
+WINDOW_GLINT_DISK = np.nonzero(np.hypot(*np.mgrid[-2:3, -2:3]) <= 2)
+WINDOW_GLINT_OFFSET = 1
+
+def pack_colors(surface, rgba):
+    """Converte cores RGBA (matriz [..., 4]) para o formato de pixel de 32 bits da superfície"""
+    rgba = np.asarray(rgba, dtype=np.uint32)
+    packed = np.zeros(rgba.shape[:-1], dtype=np.uint32)
+    for channel, (mask, shift) in enumerate(zip(surface.get_masks(), surface.get_shifts())):
+        if mask:
+            packed |= rgba[..., channel] << np.uint32(shift)
+    return packed
+
+def paint_building_texture(surf, base_color, category, is_skyscraper, rng):
+    """
+    Pinta o gradiente e a grade de janelas de um prédio na superfície (SRCALPHA).
+
+    Tudo é feito com operações de matriz sobre o buffer de pixels: uma rampa
+    multiplicada pela cor base e as janelas sorteadas de uma vez com o rng
+    (numpy.random.Generator) e gravadas por uma visão em grade do buffer,
+    no mesmo estilo do antigo desenho linha a linha.
+    """
+    width, height = surf.get_size()
+    pixels = pygame.surfarray.pixels2d(surf)
+    color = np.asarray(base_color, dtype=np.float64)
+    if category == "glass_steel":
+        # Para prédios de vidro/aço, um gradiente vertical simula reflexo
+        ramp = 0.8 + (0.2 * np.arange(height) / height)
+    else:
+        # Para outros materiais, uma sombra sutil na lateral
+        ramp = 0.85 + (0.15 * np.arange(width) / width)
+    shades = np.empty((ramp.size, 4), dtype=np.uint32)
+    shades[:, :3] = (ramp[:, None] * color).astype(np.uint32)
+    shades[:, 3] = 255
+    shades = pack_colors(surf, shades)
+    pixels[...] = shades[None, :] if category == "glass_steel" else shades[:, None]
+
+    # Grade de janelas (maiores nos arranha-céus)
+    window_width, window_height = (10, 18) if is_skyscraper else (8, 12)
+    cols = len(range(WINDOW_MARGIN, width - window_width - WINDOW_MARGIN, WINDOW_SPACING_X))
+    rows = len(range(WINDOW_MARGIN, height - window_height - WINDOW_MARGIN, WINDOW_SPACING_Y))
+    if cols and rows:
+        # Sorteio por célula (coluna, linha): 70% de chance de ter uma janela
+        shape = (cols, rows)
+        lit = rng.random(shape) < 0.7
+        color_index = rng.integers(0, len(WINDOW_COLORS), shape)
+        window_colors = pack_colors(surf, WINDOW_COLORS)
+        if category == "glass_steel":
+            # Metade das janelas de vidro se integra à fachada; algumas viram faixas
+            blended = lit & (rng.random(shape) < 0.5)
+            strip = blended & (rng.random(shape) < 0.3)
+            strip_colors = WINDOW_COLORS.copy()
+            strip_colors[:, 3] = WINDOW_STRIP_ALPHA
+            strip_colors = pack_colors(surf, strip_colors)
+            # Faixas de vidro descem da janela até a margem inferior (em ordem de linha)
+            for c, r in zip(*np.nonzero(strip)):
+                x = WINDOW_MARGIN + c * WINDOW_SPACING_X
+                y = WINDOW_MARGIN + r * WINDOW_SPACING_Y
+                pixels[x:x + window_width, y:height - WINDOW_MARGIN] = strip_colors[color_index[c, r]]
+            window = lit & ~blended
+        else:
+            window = lit
+
+        # Visão [coluna, linha, x, y] das janelas sobre o buffer da superfície
+        step_x, step_y = pixels.strides
+        origin = pixels[WINDOW_MARGIN:, WINDOW_MARGIN:]
+        grid = np.lib.stride_tricks.as_strided(
+            origin, shape=(cols, rows, window_width, window_height),
+            strides=(step_x * WINDOW_SPACING_X, step_y * WINDOW_SPACING_Y, step_x, step_y))
+        cell_x, cell_y = np.nonzero(window)
+        grid[cell_x, cell_y] = window_colors[color_index[cell_x, cell_y]][:, None, None]
+
+        # Pequeno brilho em 20% das janelas
+        glint = window & (rng.random(shape) < 0.2)
+        cell_x, cell_y = np.nonzero(glint)
+        disk_x, disk_y = WINDOW_GLINT_DISK
+        grid[cell_x[:, None], cell_y[:, None], disk_x + WINDOW_GLINT_OFFSET,
+             disk_y + WINDOW_GLINT_OFFSET] = pack_colors(surf, WINDOW_GLINT_COLOR)
+    del pixels
+    return surf
+
+def generate_buildings(screen_width=SCREEN_WIDTH, screen_height=SCREEN_HEIGHT, rng=None):
+    """Gera prédios para um cenário urbano no estilo de Nova York.
+    rng é um random.Random (por padrão, o módulo random global)."""
+    if rng is None:
+        rng = random
     buildings = []
     x = 0
+    # Gerador do NumPy para as janelas, semeado a partir do rng
+    np_rng = np.random.default_rng(rng.getrandbits(64))
     # Paleta de cores inspirada em Nova York
     nyc_building_colors = {
         "brick": [(130, 70, 60), (100, 50, 40), (150, 80, 70)],
@@ -59,99 +188,52 @@ def generate_buildings():
     dark_structure_color = (50, 50, 55) # Para antenas, caixas d'água de metal
     wood_water_tank_color = (80, 60, 40) # Madeira escura para caixas d'água
 
-    while x < SCREEN_WIDTH:
-        width = random.randint(80, 200) # Largura dos prédios
-        if x + width > SCREEN_WIDTH:
-            width = SCREEN_WIDTH - x
+    while x < screen_width:
+        width = rng.randint(80, 200) # Largura dos prédios
+        if x + width > screen_width:
+            width = screen_width - x
 
         # Alturas variadas, com chance de arranha-céus
-        is_skyscraper = random.random() < 0.15 # 15% de chance de ser um arranha-céu
+        is_skyscraper = rng.random() < 0.15 # 15% de chance de ser um arranha-céu
         if is_skyscraper:
-            height = random.randint(int(SCREEN_HEIGHT * 0.6), int(SCREEN_HEIGHT * 0.9))
+            height = rng.randint(int(screen_height * 0.6), int(screen_height * 0.9))
             building_category = "glass_steel" # Arranha-céus tendem a ser de vidro/aço
         else:
-            height = random.randint(150, int(SCREEN_HEIGHT * 0.55))
-            building_category = random.choice(["brick", "stone", "concrete"])
+            height = rng.randint(150, int(screen_height * 0.55))
+            building_category = rng.choice(["brick", "stone", "concrete"])
         
-        rect = pygame.Rect(x, SCREEN_HEIGHT - height, width, height)
+        rect = pygame.Rect(x, screen_height - height, width, height)
         
         # Escolha da cor do prédio com base na categoria
-        building_color = random.choice(nyc_building_colors[building_category])
+        building_color = rng.choice(nyc_building_colors[building_category])
         
         surf = pygame.Surface((width, height), pygame.SRCALPHA)
         
-        # Aplicar gradiente sutil ou cor base
-        # Para prédios de vidro/aço, um gradiente pode simular reflexo
-        if building_category == "glass_steel":
-            for iy in range(height):
-                reflection_factor = 0.8 + (0.2 * iy / height) # Mais claro no topo
-                column_color = (
-                    int(building_color[0] * reflection_factor),
-                    int(building_color[1] * reflection_factor),
-                    int(building_color[2] * reflection_factor)
-                )
-                pygame.draw.line(surf, column_color, (0, iy), (width, iy))
-        else: # Para outros materiais, um gradiente lateral
-            for ix_grad in range(width):
-                shadow_factor = 0.85 + (0.15 * ix_grad / width)  # Sombra sutil na lateral
-                column_color = (
-                    int(building_color[0] * shadow_factor),
-                    int(building_color[1] * shadow_factor),
-                    int(building_color[2] * shadow_factor)
-                )
-                pygame.draw.line(surf, column_color, (ix_grad, 0), (ix_grad, height))
-        
-        # Desenhar janelas
-        window_width, window_height = 8, 12
-        if is_skyscraper:
-            window_width, window_height = 10, 18 # Janelas maiores para arranha-céus
-        window_spacing_x, window_spacing_y = 15, 25
-        window_margin = 10
-        
-        window_colors = [
-            (255, 240, 180, 200),  # Luz amarela (com alfa)
-            (230, 230, 220, 200),  # Luz branca (com alfa)
-            (50, 50, 60, 150),     # Janela escura/reflexo (com alfa)
-            (20, 20, 30, 220)      # Janela bem escura (com alfa)
-        ]
-
-        for r in range(window_margin, height - window_height - window_margin, window_spacing_y):
-            for c in range(window_margin, width - window_width - window_margin, window_spacing_x):
-                if random.random() < 0.7: # 70% de chance de ter uma janela
-                    win_color = random.choice(window_colors)
-                    # Para prédios de vidro, as janelas podem ser mais integradas ou ser a própria textura
-                    if building_category == "glass_steel" and random.random() < 0.5:
-                        # Simular faixas de vidro ou reflexos
-                        if random.random() < 0.3:
-                             pygame.draw.rect(surf, (win_color[0],win_color[1],win_color[2], 100), (c, r, window_width, height - r - window_margin), border_radius=1)
-                        # else: não desenha janela individual, o gradiente do prédio já faz o efeito
-                    else:
-                        pygame.draw.rect(surf, win_color, (c, r, window_width, window_height), border_radius=1)
-                        if random.random() < 0.2: # Pequeno brilho na janela
-                            pygame.draw.circle(surf, (255,255,255,50), (c+3,r+3),2)
+        # Gradiente e janelas gerados como matrizes, direto no buffer da superfície
+        paint_building_texture(surf, building_color, building_category, is_skyscraper, np_rng)
 
         # Detalhes no topo do prédio
         top_y_offset = 5 # Pequeno offset para desenhar no topo
         # Parapeito simples para prédios mais baixos
-        if not is_skyscraper and random.random() < 0.6:
-            parapet_height = random.randint(5, 10)
+        if not is_skyscraper and rng.random() < 0.6:
+            parapet_height = rng.randint(5, 10)
             parapet_color = (int(building_color[0]*0.7), int(building_color[1]*0.7), int(building_color[2]*0.7))
             pygame.draw.rect(surf, parapet_color, (0, 0, width, parapet_height))
             top_y_offset += parapet_height
 
         # Antenas (mais comuns em arranha-céus ou prédios altos)
-        if (is_skyscraper or random.random() < 0.3) and random.random() < 0.5:
-            num_antennas = random.randint(1, 3 if is_skyscraper else 1)
+        if (is_skyscraper or rng.random() < 0.3) and rng.random() < 0.5:
+            num_antennas = rng.randint(1, 3 if is_skyscraper else 1)
             for _ in range(num_antennas):
-                antenna_height = random.randint(20, 60 if is_skyscraper else 40)
-                antenna_width = random.randint(2, 5 if is_skyscraper else 3)
-                antenna_x = random.randint(width//4, width - width//4 - antenna_width)
+                antenna_height = rng.randint(20, 60 if is_skyscraper else 40)
+                antenna_width = rng.randint(2, 5 if is_skyscraper else 3)
+                antenna_x = rng.randint(width//4, width - width//4 - antenna_width)
                 pygame.draw.rect(surf, dark_structure_color, (antenna_x, top_y_offset - antenna_height, antenna_width, antenna_height))
-                if random.random() < 0.7:
+                if rng.random() < 0.7:
                     pygame.draw.circle(surf, (255, 0, 0, 200), (antenna_x + antenna_width//2, top_y_offset - antenna_height), 2)
         
         # Caixas d'água (mais comuns em prédios de tijolo/pedra mais antigos)
-        if not is_skyscraper and building_category in ["brick", "stone"] and random.random() < 0.4:
+        if not is_skyscraper and building_category in ["brick", "stone"] and rng.random() < 0.4:
             margin = 10
             min_tank_width_content = 20 
             max_tank_width_content_limit = 50
@@ -162,20 +244,22 @@ def generate_buildings():
                 max_tank_width_allowed_by_building = width - (2 * margin)
                 actual_max_tank_width = min(max_tank_width_content_limit, max_tank_width_allowed_by_building)
                 if actual_max_tank_width >= min_tank_width_content:
-                    tank_width = random.randint(min_tank_width_content, actual_max_tank_width)
-                    tank_height = random.randint(min_tank_height, max_tank_height)
+                    tank_width = rng.randint(min_tank_width_content, actual_max_tank_width)
+                    tank_height = rng.randint(min_tank_height, max_tank_height)
                     tank_x_start_range_on_surf = margin
                     tank_x_end_range_on_surf = width - tank_width - margin
                     if tank_x_start_range_on_surf <= tank_x_end_range_on_surf:
-                        tank_x_on_surf = random.randint(tank_x_start_range_on_surf, tank_x_end_range_on_surf)
-                        tank_color = wood_water_tank_color if random.random() < 0.7 else dark_structure_color # Madeira ou metal
+                        tank_x_on_surf = rng.randint(tank_x_start_range_on_surf, tank_x_end_range_on_surf)
+                        tank_color = wood_water_tank_color if rng.random() < 0.7 else dark_structure_color # Madeira ou metal
                         pygame.draw.rect(surf, tank_color, (tank_x_on_surf, top_y_offset, tank_width, tank_height))
                         # Pernas da caixa d'água
                         leg_height = 5
                         pygame.draw.line(surf, dark_structure_color, (tank_x_on_surf + 2, top_y_offset + tank_height), (tank_x_on_surf + 2, top_y_offset + tank_height + leg_height), 2)
                         pygame.draw.line(surf, dark_structure_color, (tank_x_on_surf + tank_width - 2, top_y_offset + tank_height), (tank_x_on_surf + tank_width - 2, top_y_offset + tank_height + leg_height), 2)
         
-        buildings.append({"surf": surf, "rect": rect})
+        building = {"surf": surf, "rect": rect}
+        init_building_integrity(building)
+        buildings.append(building)
         x += width
     return buildings
 
@@ -183,81 +267,130 @@ def draw_buildings(screen, buildings):
     for b in buildings:
         screen.blit(b["surf"], b["rect"].topleft)
 
+def compose_world(background, buildings):
+    """Camada estática do cenário: fundo e prédios numa única superfície"""
+    world = background.copy()
+    draw_buildings(world, buildings)
+    return world
+
+def recompose_world_area(world, background, buildings, area):
+    """Recompõe só uma área da camada do cenário (após uma cratera ou desabamento)"""
+    area = world.get_rect().clip(area)
+    world.blit(background, area, area)
+    for b in buildings:
+        rect = b["rect"]
+        if rect.colliderect(area):
+            clip = rect.clip(area)
+            world.blit(b["surf"], clip, clip.move(-rect.x, -rect.y))
+    return area
+
+def carve_crater(surf, center, radius):
+    """
+    Remove (torna transparentes) os pixels da superfície dentro do círculo.
+
+    center está nas coordenadas da superfície. Retorna (x0, y0, removed),
+    onde removed marca os pixels visíveis que foram apagados na caixa que
+    começa em (x0, y0), ou None se o círculo não toca a superfície.
+    """
+    box = crater_box(surf.get_size(), center, radius)
+    if box is None:
+        return None
+    x0, y0, x1, y1, mask = box
+
+    pixels = pygame.surfarray.pixels2d(surf)
+    box = pixels[x0:x1, y0:y1]
+    # Pixels que ainda estavam visíveis (alfa > 0) antes do impacto
+    removed = mask & ((box & surf.get_masks()[3]) != 0)
+    # Zerar RGBA de uma vez (equivalente a set_at(..., (0, 0, 0, 0)))
+    box[mask] = 0
+    del pixels, box
+    return x0, y0, removed
+
 def damage_building(building, center, radius):
     """Causa dano (remove pixels) em um prédio a partir de um ponto"""
+    if "base_columns" not in building:
+        init_building_integrity(building)
+    local_center = (center[0] - building["rect"].x, center[1] - building["rect"].y)
+    carved = carve_crater(building["surf"], local_center, radius)
+    if carved:
+        update_building_integrity(building, *carved)
+    with PROFILER.stage("check_building_collapse"):
+        return check_building_collapse(building)
+
+def init_building_integrity(building):
+    """Conta, por coluna, os pixels intactos da base do prédio (varredura completa)
+    e guarda a máscara de pixels sólidos usada na detecção de colisão"""
     surf = building["surf"]
-    x, y = center[0] - building["rect"].x, center[1] - building["rect"].y
-    # Converter para inteiros para usar no range
-    x_int, y_int = int(x), int(y)
-    radius_int = int(radius)
-    
-    # Usar valores inteiros para o range
-    for py in range(max(0, y_int-radius_int), min(surf.get_height(), y_int+radius_int+1)):
-        for px in range(max(0, x_int-radius_int), min(surf.get_width(), x_int+radius_int+1)):
-            # Usar valores originais (float) para o cálculo de distância para maior precisão
-            if math.hypot(px-x, py-y) <= radius:
-                surf.set_at((px, py), (0, 0, 0, 0))
-    
-    return check_building_collapse(building)
+    height = surf.get_height()
+    # Verificar os 30 pixels inferiores ou 20% da altura
+    base_check_height = min(30, height // 5)
+    alpha = pygame.surfarray.pixels_alpha(surf)
+    building["solid"] = alpha != 0
+    building["base_top"] = height - base_check_height
+    building["base_columns"] = np.count_nonzero(alpha[:, height - base_check_height:], axis=1)
+    building["base_intact"] = int(building["base_columns"].sum())
+    building["base_total"] = surf.get_width() * base_check_height
+    del alpha
+
+def update_building_integrity(building, x0, y0, removed):
+    """Desconta da base (e da máscara sólida) os pixels removidos por uma cratera"""
+    building["solid"][x0:x0 + removed.shape[0], y0:y0 + removed.shape[1]] &= ~removed
+    skip = max(0, building["base_top"] - y0)
+    if skip >= removed.shape[1]:
+        return  # A cratera não alcançou a base
+    lost = np.count_nonzero(removed[:, skip:], axis=1)
+    building["base_columns"][x0:x0 + len(lost)] -= lost
+    building["base_intact"] -= int(lost.sum())
 
 def check_building_collapse(building):
     """Verifica se um prédio tem sustentação ou deve desabar"""
-    surf = building["surf"]
-    width = surf.get_width()
-    height = surf.get_height()
-    
-    # Verificar se a base do prédio foi danificada demais
-    base_intact_pixels = 0
-    base_check_height = min(30, height // 5)  # Verificar os 30 pixels inferiores ou 20% da altura
-    
-    for px in range(width):
-        for py in range(height - base_check_height, height):
-            # Verificar se o pixel ainda existe (não é transparente)
-            if surf.get_at((px, py))[3] > 0:  # Alpha > 0 significa que o pixel é visível
-                base_intact_pixels += 1
-    
+    if "base_columns" not in building:
+        init_building_integrity(building)
+
     # Calcular a porcentagem de pixels intactos na base
-    base_total_pixels = width * base_check_height
-    base_intact_percentage = base_intact_pixels / base_total_pixels
+    base_intact_percentage = building["base_intact"] / building["base_total"]
     
     # Se menos de 30% da base estiver intacta, o prédio deve desabar
     return base_intact_percentage < 0.3
 
-def create_background():
-    """Cria um plano de fundo urbano noturno para o jogo"""
-    surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+def create_background(screen_width=SCREEN_WIDTH, screen_height=SCREEN_HEIGHT, rng=None):
+    """Cria um plano de fundo urbano noturno para o jogo.
+    rng é um random.Random (por padrão, o módulo random global)."""
+    if rng is None:
+        rng = random
+    surf = pygame.Surface((screen_width, screen_height))
     
     # Gradiente de céu noturno - do azul escuro para preto
     top_color = (10, 20, 40)  # Azul muito escuro no topo
     bottom_color = (5, 5, 15)  # Quase preto embaixo
     
-    for y in range(SCREEN_HEIGHT):
-        ratio = y / SCREEN_HEIGHT
+    for y in range(screen_height):
+        ratio = y / screen_height
         r = int(top_color[0] + (bottom_color[0] - top_color[0]) * ratio)
         g = int(top_color[1] + (bottom_color[1] - top_color[1]) * ratio)
         b = int(top_color[2] + (bottom_color[2] - top_color[2]) * ratio)
-        pygame.draw.line(surf, (r, g, b), (0, y), (SCREEN_WIDTH, y))
+        pygame.draw.line(surf, (r, g, b), (0, y), (screen_width, y))
     
     # Adicionar estrelas aleatórias
     for _ in range(100):
-        star_x = random.randint(0, SCREEN_WIDTH)
-        star_y = random.randint(0, SCREEN_HEIGHT // 2)
-        brightness = random.randint(150, 255)
-        size = random.randint(1, 2)
+        star_x = rng.randint(0, screen_width)
+        star_y = rng.randint(0, screen_height // 2)
+        brightness = rng.randint(150, 255)
+        size = rng.randint(1, 2)
         pygame.draw.circle(surf, (brightness, brightness, brightness), (star_x, star_y), size)
     
     # Lua com crateras para um aspecto mais realista
     moon_radius = 40
-    moon_x, moon_y = SCREEN_WIDTH - 120, 80
+    moon_x, moon_y = screen_width - 120, 80
     
     # Lua base
     pygame.draw.circle(surf, (220, 220, 200), (moon_x, moon_y), moon_radius)
     
     # Adicionar algumas crateras para realismo
     for _ in range(6):
-        crater_size = random.randint(4, 10)
-        crater_x = moon_x + random.randint(-moon_radius + 10, moon_radius - 10)
-        crater_y = moon_y + random.randint(-moon_radius + 10, moon_radius - 10)
+        crater_size = rng.randint(4, 10)
+        crater_x = moon_x + rng.randint(-moon_radius + 10, moon_radius - 10)
+        crater_y = moon_y + rng.randint(-moon_radius + 10, moon_radius - 10)
         # Certificar que a cratera está dentro da lua
         if math.hypot(crater_x - moon_x, crater_y - moon_y) < moon_radius - crater_size:
             pygame.draw.circle(surf, (180, 180, 160), (crater_x, crater_y), crater_size)
@@ -276,28 +409,106 @@ def create_background():
     
     # Adicionar silhueta de cidade distante (efeito de profundidade)
     city_height = 30
-    city_y = SCREEN_HEIGHT - 280  # Posicionar acima dos prédios principais
+    city_y = screen_height - 280  # Posicionar acima dos prédios principais
     
     # Criar uma silhueta irregular para a cidade distante
-    for x in range(0, SCREEN_WIDTH, 20):
-        height_var = random.randint(10, city_height)
-        width_var = random.randint(15, 35)
+    for x in range(0, screen_width, 20):
+        height_var = rng.randint(10, city_height)
+        width_var = rng.randint(15, 35)
         pygame.draw.rect(surf, (20, 20, 30), 
                         (x, city_y - height_var, width_var, height_var))
     
     return surf
 
-def draw_explosion(screen, pos, progress):
-    """Desenha uma explosão realista e dramática"""
-    x, y = int(pos[0]), int(pos[1])
+# Versão do gerador de cenários: incrementar sempre que generate_buildings ou
+# create_background mudarem o resultado para uma mesma semente (invalida o cache)
+WORLD_GENERATOR_VERSION = 1
+
+def build_world(seed, screen_width=SCREEN_WIDTH, screen_height=SCREEN_HEIGHT):
+    """
+    Cenário (fundo, prédios) reproduzível a partir de uma semente.
+
+    Os dois geradores usam o mesmo random.Random(seed), então a mesma
+    semente sempre gera a mesma cidade. O resultado fica no cache em disco,
+    e uma semente já vista é carregada em vez de gerada.
+    """
+    size = (screen_width, screen_height)
+    cached = world_cache.load_world(seed, size, WORLD_GENERATOR_VERSION)
+    if cached is not None:
+        background, buildings = cached
+        for building in buildings:
+            init_building_integrity(building)
+        return background, buildings
+    rng = random.Random(seed)
+    background = create_background(screen_width, screen_height, rng)
+    buildings = generate_buildings(screen_width, screen_height, rng)
+    try:
+        world_cache.save_world(seed, size, WORLD_GENERATOR_VERSION, background, buildings)
+    except OSError:
+        pass  # Sem cache em disco: o cenário só é gerado de novo na próxima vez
+    return background, buildings
+
+def place_players(buildings):
+    """Posições dos gorilas sobre os prédios do cenário"""
+    # Posicionar jogadores em prédios mais centrais
+    if len(buildings) >= 5:
+        p1_building_index = 2  # Terceiro prédio da esquerda
+        p2_building_index = -3  # Terceiro prédio da direita
+    elif len(buildings) >= 3:
+        p1_building_index = 1
+        p2_building_index = -2
+    else:  # Caso extremo com poucos prédios
+        p1_building_index = 0
+        p2_building_index = -1
+    
+    p1_rect = buildings[p1_building_index]["rect"]
+    p2_rect = buildings[p2_building_index]["rect"]
+    
+    # Ajustar a altura Y para os gorilas sobre os prédios
+    offset_y_para_pes_no_predio = MONKEY_RADIUS * 1.5
+    
+    return [
+        (p1_rect.centerx, p1_rect.top - offset_y_para_pes_no_predio),
+        (p2_rect.centerx, p2_rect.top - offset_y_para_pes_no_predio),
+    ]
+
+# A semente é gravada como inteiro de 64 bits com sinal (cache de
+# cenários, jogo salvo e replays)
+SEED_MIN = -2 ** 63
+SEED_MAX = 2 ** 63 - 1
+
+def new_world_seed():
+    """Semente aleatória para um novo cenário"""
+    return random.getrandbits(31)
+
+# Quadros pré-renderizados da animação de explosão (progresso quantizado)
+EXPLOSION_FRAMES = 32
+EXPLOSION_PARTICLE_COLORS = [(100, 100, 100), (80, 80, 80), (60, 60, 60)]
+
+def composite_over(dst, src):
+    """Compõe src sobre dst (operador "over" com alfa não pré-multiplicado), no lugar"""
+    src_a = pygame.surfarray.array_alpha(src).astype(np.float32)[..., None] / 255.0
+    dst_a = pygame.surfarray.array_alpha(dst).astype(np.float32)[..., None] / 255.0
+    out_a = src_a + dst_a * (1.0 - src_a)
+    out_rgb = (pygame.surfarray.array3d(src) * src_a
+               + pygame.surfarray.array3d(dst) * dst_a * (1.0 - src_a))
+    np.divide(out_rgb, out_a, out=out_rgb, where=out_a > 0)
+    pygame.surfarray.pixels3d(dst)[...] = np.rint(out_rgb).astype(np.uint8)
+    pygame.surfarray.pixels_alpha(dst)[...] = np.rint(out_a[..., 0] * 255).astype(np.uint8)
+
+def render_explosion_frame(progress, rng):
+    """Desenha um quadro da explosão, centrado, em uma superfície transparente"""
+    frame_size = EXPLOSION_RADIUS * 2 + 1
+    x, y = EXPLOSION_RADIUS, EXPLOSION_RADIUS
+    frame = pygame.Surface((frame_size, frame_size), pygame.SRCALPHA)
+    layer = pygame.Surface((frame_size, frame_size), pygame.SRCALPHA)
     
     # 1. Núcleo brilhante
     core_radius = int(EXPLOSION_RADIUS * progress * 0.4)
-    pygame.draw.circle(screen, (255, 255, 220), (x, y), core_radius)
+    pygame.draw.circle(frame, (255, 255, 220), (x, y), core_radius)
     
     # 2. Camada de choque principal
     main_radius = int(EXPLOSION_RADIUS * progress * 0.8)
-    glow_surf = pygame.Surface((main_radius*2, main_radius*2), pygame.SRCALPHA)
     for r in range(main_radius, int(main_radius*0.4), -2):
         alpha = 255 - int((main_radius - r) * (255 / main_radius * 0.7))
         # Gradiente de cores de explosão (amarelo -> laranja -> vermelho)
@@ -309,10 +520,10 @@ def draw_explosion(screen, pos, progress):
             color = (255, 100, 20, alpha)   # Laranja
         else:
             color = (200, 50, 20, alpha)    # Vermelho
-        pygame.draw.circle(glow_surf, color, (main_radius, main_radius), r)
+        pygame.draw.circle(layer, color, (x, y), r)
     
     # Aplicar a camada principal
-    screen.blit(glow_surf, (x - main_radius, y - main_radius))
+    composite_over(frame, layer)
     
     # 3. Onda de choque externa
     outer_radius = int(EXPLOSION_RADIUS * progress)
@@ -320,10 +531,10 @@ def draw_explosion(screen, pos, progress):
     shock_color = (200, 200, 200, 100)
     
     # Desenhar anel externo
-    shock_surf = pygame.Surface((outer_radius*2, outer_radius*2), pygame.SRCALPHA)
-    pygame.draw.circle(shock_surf, shock_color, (outer_radius, outer_radius), outer_radius)
-    pygame.draw.circle(shock_surf, (0, 0, 0, 0), (outer_radius, outer_radius), outer_radius - shock_width)
-    screen.blit(shock_surf, (x - outer_radius, y - outer_radius))
+    layer.fill((0, 0, 0, 0))
+    pygame.draw.circle(layer, shock_color, (x, y), outer_radius)
+    pygame.draw.circle(layer, (0, 0, 0, 0), (x, y), outer_radius - shock_width)
+    composite_over(frame, layer)
     
     # 4. Partículas (opção simplificada sem rastreamento de partículas individuais)
     particles_count = 12
@@ -333,15 +544,33 @@ def draw_explosion(screen, pos, progress):
         particle_x = x + math.cos(angle) * dist
         particle_y = y + math.sin(angle) * dist
         size = max(2, int(5 * (1 - progress)))
-        color = random.choice([(100, 100, 100), (80, 80, 80), (60, 60, 60)])
-        pygame.draw.circle(screen, color, (int(particle_x), int(particle_y)), size)
+        color = rng.choice(EXPLOSION_PARTICLE_COLORS)
+        pygame.draw.circle(frame, color, (int(particle_x), int(particle_y)), size)
+    return frame
+
+@functools.lru_cache(maxsize=1)
+def get_explosion_frames():
+    """Renderiza uma única vez todos os quadros da explosão"""
+    # Semente fixa: as cores das partículas variam entre quadros, mas não entre partidas
+    rng = random.Random(EXPLOSION_RADIUS)
+    return tuple(render_explosion_frame(i / (EXPLOSION_FRAMES - 1), rng)
+                 for i in range(EXPLOSION_FRAMES))
 
-def draw_banana(screen, banana):
-    """Desenha uma banana realista com efeito de movimento"""
-    vx, vy = banana["vel"]
-    angle = math.degrees(math.atan2(-vy, vx))
-    x, y = banana["pos"]
-    
+def draw_explosion(screen, pos, progress):
+    """Desenha uma explosão realista e dramática (um blit do quadro pré-renderizado).
+    Retorna a área ocupada na tela."""
+    frames = get_explosion_frames()
+    index = min(EXPLOSION_FRAMES - 1, max(0, int(progress * (EXPLOSION_FRAMES - 1) + 0.5)))
+    return screen.blit(frames[index], (int(pos[0]) - EXPLOSION_RADIUS, int(pos[1]) - EXPLOSION_RADIUS))
+
+# Atlas da banana: ângulos pré-rotacionados e níveis do rastro pré-escalados
+BANANA_ANGLE_STEP = 5  # Graus entre rotações pré-calculadas
+BANANA_TRAIL_SEGMENTS = 5
+# Passos de física entre segmentos do rastro (~0.05 s, como o rastro antigo)
+BANANA_TRAIL_STRIDE = 6
+
+def render_banana_surface():
+    """Desenha a banana (sem rotação) em uma superfície transparente"""
     # Dimensões da banana
     banana_width = BANANA_RADIUS * 6
     banana_height = BANANA_RADIUS * 2.5
@@ -354,14 +583,6 @@ def draw_banana(screen, banana):
     dark_yellow = (220, 220, 0)
     highlight = (255, 255, 200)
     
-    # Desenhar a forma curva da banana (arco)
-    curve_angle = 30  # Graus de curvatura
-    curve_radius = banana_height * 2
-    
-    # Centro do arco maior
-    arc_center_x = banana_width // 2
-    arc_center_y = banana_height * 2
-    
     # Desenhar a banana em camadas para dar profundidade
     # Camada base (mais escura)
     pygame.draw.ellipse(surf, dark_yellow, (0, 0, banana_width, banana_height))
@@ -386,40 +607,82 @@ def draw_banana(screen, banana):
         end_width = banana_width * 0.15
         end_height = banana_height * 0.4
         pygame.draw.ellipse(surf, dark_yellow, (end_x - end_width/2, end_y - end_height/2, end_width, end_height))
-    
-    # Rotacionar a banana
-    rot = pygame.transform.rotate(surf, angle)
-    rect = rot.get_rect(center=(int(x), int(y)))
-    
-    # Adicionar rastro de movimento para mostrar a trajetória
-    # Criar uma superfície para o rastro
-    trail_segments = 5
-    for i in range(1, trail_segments+1):
-        # Calcular posição anterior na trajetória
-        trail_x = x - vx * i * 0.05
-        trail_y = y - vy * i * 0.05
-        
-        # Diminuir o tamanho e opacidade para cada segmento do rastro
-        trail_scale = 1.0 - (i * 0.15)
-        trail_alpha = 255 - (i * 40)
-        
-        # Criar uma versão reduzida e mais transparente da banana
-        if trail_scale > 0.2:  # Evitar rastros muito pequenos
+    return surf
+
+@functools.lru_cache(maxsize=1)
+def get_banana_atlas():
+    """
+    Pré-renderiza a banana em todos os ângulos e níveis de rastro.
+
+    atlas[ângulo][nível] = (superfície, meia largura, meia altura); o nível 0
+    é a banana principal e os níveis 1..BANANA_TRAIL_SEGMENTS são as cópias
+    menores e mais transparentes do rastro.
+    """
+    base = render_banana_surface()
+    atlas = []
+    for step in range(360 // BANANA_ANGLE_STEP):
+        rot = pygame.transform.rotate(base, step * BANANA_ANGLE_STEP)
+        levels = [(rot, rot.get_width() // 2, rot.get_height() // 2)]
+        for i in range(1, BANANA_TRAIL_SEGMENTS + 1):
+            # Diminuir o tamanho e opacidade para cada segmento do rastro
+            trail_scale = 1.0 - (i * 0.15)
             scaled_width = int(rot.get_width() * trail_scale)
             scaled_height = int(rot.get_height() * trail_scale)
-            if scaled_width > 0 and scaled_height > 0:  # Verificar dimensões válidas
-                trail_surf = pygame.transform.scale(rot.copy(), (scaled_width, scaled_height))
-                # Ajustar a opacidade
-                trail_surf.set_alpha(trail_alpha)
-                # Calcular posição para centralizar o rastro
-                trail_rect = trail_surf.get_rect(center=(int(trail_x), int(trail_y)))
-                screen.blit(trail_surf, trail_rect)
+            if trail_scale <= 0.2 or scaled_width <= 0 or scaled_height <= 0:
+                levels.append(None)  # Evitar rastros muito pequenos
+                continue
+            trail_surf = pygame.transform.scale(rot, (scaled_width, scaled_height))
+            trail_surf.set_alpha(255 - (i * 40))
+            levels.append((trail_surf, scaled_width // 2, scaled_height // 2))
+        atlas.append(levels)
+    return atlas
+
+def new_banana_trail():
+    """Buffer circular com as últimas posições reais da banana"""
+    return deque(maxlen=BANANA_TRAIL_SEGMENTS * BANANA_TRAIL_STRIDE + 1)
+
+def new_banana(origin, turn, angle, power):
+    """Cria a banana lançada pelo jogador da vez"""
+    # Posição e velocidade iniciais (com deslocamento para evitar colisão imediata)
+    start_pos, start_vel = physics.launch(
+        origin, angle, power, turn,
+        VEL_FACTOR, MONKEY_RADIUS + BANANA_RADIUS + 5)
+    return {
+        "pos": start_pos, 
+        "prev_pos": list(start_pos),
+        "trail": new_banana_trail(),
+        "vel": start_vel,
+        "owner": turn,
+        "time_alive": 0
+    }
+
+def draw_banana(screen, banana, alpha=1.0):
+    """Desenha uma banana realista com efeito de movimento.
+    alpha interpola entre o passo de física anterior e o atual.
+    Retorna a área ocupada na tela (banana e rastro)."""
+    vx, vy = banana["vel"]
+    angle = math.degrees(math.atan2(-vy, vx))
+    x, y = physics.interpolate(banana.get("prev_pos", banana["pos"]), banana["pos"], alpha)
+    levels = get_banana_atlas()[int(round(angle / BANANA_ANGLE_STEP)) % (360 // BANANA_ANGLE_STEP)]
+    
+    # Rastro de movimento com as posições anteriores registradas pela física
+    trail = banana.get("trail", ())
+    area = pygame.Rect(int(x), int(y), 0, 0)
+    for i in range(1, BANANA_TRAIL_SEGMENTS + 1):
+        index = len(trail) - 1 - i * BANANA_TRAIL_STRIDE
+        if index < 0:
+            break
+        if levels[i]:
+            trail_surf, half_w, half_h = levels[i]
+            trail_x, trail_y = trail[index]
+            area = area.union(screen.blit(trail_surf, (int(trail_x) - half_w, int(trail_y) - half_h)))
     
     # Desenhar a banana principal
-    screen.blit(rot, rect)
+    rot, half_w, half_h = levels[0]
+    return area.union(screen.blit(rot, (int(x) - half_w, int(y) - half_h)))
 
 def draw_health_bar(screen, pos, health, max_health, width=50, height=5, border=1):
-    """Desenha uma barra de energia acima do gorila"""
+    """Desenha uma barra de energia acima do gorila e retorna sua área"""
     x, y = pos
     # Posicionar barra acima do gorila
     bar_pos = (x - width//2, y - MONKEY_RADIUS * 2.5)
@@ -437,17 +700,50 @@ def draw_health_bar(screen, pos, health, max_health, width=50, height=5, border=
         color = (200, 0, 0)  # Vermelho
     
     # Desenhar borda
-    pygame.draw.rect(screen, (50, 50, 50), (bar_pos[0], bar_pos[1], width, height))
+    area = pygame.draw.rect(screen, (50, 50, 50), (bar_pos[0], bar_pos[1], width, height))
     
     # Desenhar barra de saúde
     if health > 0:
         pygame.draw.rect(screen, color, (bar_pos[0], bar_pos[1], filled_width, height))
-
-def draw_monkey(screen, pos, color, health=MAX_GORILLA_HEALTH):
+    return area
+
+# Caixa do gorila procedural relativa à posição (x, y) do gorila
+MONKEY_SPRITE_SIZE = (MONKEY_RADIUS * 8, MONKEY_RADIUS * 8)
+MONKEY_SPRITE_ORIGIN = (MONKEY_RADIUS * 4, MONKEY_RADIUS * 3)
+MONKEY_SPRITE_CACHE_SIZE = 12
+# Sprites procedurais já renderizados: (cor, lado) -> Surface. A energia
+# só muda a barra, desenhada à parte a cada quadro
+_monkey_sprite_cache = OrderedDict()
+
+def get_monkey_sprite(color, facing=1):
+    """Retorna o gorila procedural pré-renderizado, desenhando-o só na primeira vez"""
+    key = (tuple(color), facing)
+    sprite = _monkey_sprite_cache.get(key)
+    if sprite is not None:
+        _monkey_sprite_cache.move_to_end(key)
+        return sprite
+
+    sprite = pygame.Surface(MONKEY_SPRITE_SIZE, pygame.SRCALPHA)
+    render_monkey(sprite, MONKEY_SPRITE_ORIGIN, color)
+    if facing < 0:
+        sprite = pygame.transform.flip(sprite, True, False)
+    _monkey_sprite_cache[key] = sprite
+    if len(_monkey_sprite_cache) > MONKEY_SPRITE_CACHE_SIZE:
+        _monkey_sprite_cache.popitem(last=False)
+    return sprite
+
+def draw_monkey(screen, pos, color, health=MAX_GORILLA_HEALTH, facing=1):
     """Desenha um gorila musculoso com pelos escuros, buscando um estilo mais realista.
-    Inclui uma barra de energia acima do gorila."""
+    Inclui uma barra de energia acima do gorila. O desenho vem do cache de sprites,
+    então cada quadro custa um blit mais a barra. Retorna a área ocupada na tela."""
     # Desenhar a barra de energia primeiro
-    draw_health_bar(screen, pos, health, MAX_GORILLA_HEALTH)
+    area = draw_health_bar(screen, pos, health, MAX_GORILLA_HEALTH)
+    sprite = get_monkey_sprite(color, facing)
+    origin_x = MONKEY_SPRITE_ORIGIN[0] if facing > 0 else MONKEY_SPRITE_SIZE[0] - MONKEY_SPRITE_ORIGIN[0]
+    return area.union(screen.blit(sprite, (int(pos[0]) - origin_x, int(pos[1]) - MONKEY_SPRITE_ORIGIN[1])))
+
+def render_monkey(screen, pos, color):
+    """Desenha o corpo do gorila procedural (sem a barra de energia) na superfície"""
     x, y = pos
     radius = MONKEY_RADIUS # radius agora é o novo tamanho aumentado
 
@@ -837,19 +1133,18 @@ def draw_monkey(screen, pos, color, health=MAX_GORILLA_HEALTH):
     darker_accent = (max(0, accent_color[0]-60), max(0, accent_color[1]-60), max(0, accent_color[2]-60))
     pygame.draw.lines(screen, darker_accent, True, accessory_points, int(radius*0.07))
 
+# Filtro de quadrinhos compartilhado (mantém a máscara entre quadros)
+COMIC_FILTER = ComicFilter()
+
 def apply_comic_filter(surface):
-    """Aplica efeito de pixel art simples, limitando a paleta de cores"""
-    # Converter para PIL
-    raw_str = pygame.image.tostring(surface, "RGB")
-    pil_img = Image.frombytes("RGB", surface.get_size(), raw_str)
-    
-    # Posterizar para reduzir o número de cores (estilo pixel art)
-    poster = ImageOps.posterize(pil_img, 3)
-    
-    # Converter de volta para pygame
-    result = pygame.image.fromstring(poster.tobytes(), poster.size, poster.mode)
-    
-    return result
+    """Aplica efeito de pixel art simples, limitando a paleta de cores (no lugar)"""
+    return COMIC_FILTER.apply(surface)
+
+# Textos renderizados da interface (HUD, menus, recordes, vitória)
+TEXT_CACHE = TextCache()
+
+# Tempo de cada etapa do quadro (F3 mostra a sobreposição)
+PROFILER = FrameProfiler()
 
 # Estados do jogo
 GAME_STATE_MENU = 0
@@ -861,9 +1156,17 @@ GAME_STATE_NAME_INPUT = 5
 
 # Opções de menu
 MENU_NEW_GAME = 0
-MENU_CONTINUE = 1
-MENU_HIGH_SCORES = 2
-MENU_QUIT = 3
+MENU_NEW_GAME_CPU = 1
+MENU_CONTINUE = 2
+MENU_HIGH_SCORES = 3
+MENU_QUIT = 4
+MENU_OPTION_COUNT = 5
+
+# Indicador exibido enquanto a CPU pensa (pontos animados a cada AI_THINKING_DOT_MS)
+AI_THINKING_COLOR = (255, 220, 120)
+AI_THINKING_DOT_MS = 300
+# Lançamento da CPU quando a busca falha ou termina sem resultado
+AI_FALLBACK_SHOT = (45, 50)
 
 # Cores para o menu
 MENU_BG_COLOR = (30, 30, 50)  # Azul escuro
@@ -876,12 +1179,13 @@ def draw_menu(screen, font, large_font, selected_option, has_saved_game):
     screen.fill(MENU_BG_COLOR)
     
     # Título do jogo
-    title = large_font.render("GORILLAS 2.0", True, MENU_TITLE_COLOR)
+    title = TEXT_CACHE.render(large_font, "GORILLAS 2.0", MENU_TITLE_COLOR)
     screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 100))
     
     # Opções do menu
     menu_options = [
         "Novo Jogo",
+        "Novo Jogo vs CPU",
         "Continuar" if has_saved_game else "Continuar (Indisponível)",
         "Recordes",
         "Sair"
@@ -895,38 +1199,36 @@ def draw_menu(screen, font, large_font, selected_option, has_saved_game):
         else:
             color = MENU_HIGHLIGHT_COLOR if i == selected_option else MENU_TEXT_COLOR
             
-        text = font.render(option, True, color)
+        text = TEXT_CACHE.render(font, option, color)
         screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, start_y + i * 60))
     
     # Instruções
-    instructions = font.render("Use as setas para navegar e ENTER para selecionar", True, MENU_TEXT_COLOR)
+    instructions = TEXT_CACHE.render(font, "Use as setas para navegar e ENTER para selecionar", MENU_TEXT_COLOR)
     screen.blit(instructions, (SCREEN_WIDTH // 2 - instructions.get_width() // 2, SCREEN_HEIGHT - 100))
-    
-    pygame.display.flip()
 
 def draw_high_scores(screen, font, large_font, high_scores):
     """Desenha a tela de recordes"""
     screen.fill(MENU_BG_COLOR)
     
     # Título
-    title = large_font.render("RECORDES", True, MENU_TITLE_COLOR)
+    title = TEXT_CACHE.render(large_font, "RECORDES", MENU_TITLE_COLOR)
     screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 50))
     
     if not high_scores:
-        text = font.render("Nenhum recorde encontrado", True, MENU_TEXT_COLOR)
+        text = TEXT_CACHE.render(font, "Nenhum recorde encontrado", MENU_TEXT_COLOR)
         screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2))
     else:
         # Cabeçalho
-        header = font.render("Posição  Nome              Pontuação  Data", True, MENU_HIGHLIGHT_COLOR)
+        header = TEXT_CACHE.render(font, "Posição  Nome              Pontuação  Data", MENU_HIGHLIGHT_COLOR)
         screen.blit(header, (SCREEN_WIDTH // 2 - 200, 150))
         
         # Lista de recordes
         start_y = 200
         for i, score in enumerate(high_scores[:10]):
-            rank_text = font.render(f"{i+1:<8}", True, MENU_TEXT_COLOR)
-            name_text = font.render(f"{score['name']:<18}", True, MENU_TEXT_COLOR)
-            score_text = font.render(f"{score['score']:<10}", True, MENU_TEXT_COLOR)
-            date_text = font.render(score.get('timestamp', 'N/A'), True, MENU_TEXT_COLOR)
+            rank_text = TEXT_CACHE.render(font, f"{i+1:<8}", MENU_TEXT_COLOR)
+            name_text = TEXT_CACHE.render(font, f"{score['name']:<18}", MENU_TEXT_COLOR)
+            score_text = TEXT_CACHE.render(font, f"{score['score']:<10}", MENU_TEXT_COLOR)
+            date_text = TEXT_CACHE.render(font, score.get('timestamp', 'N/A'), MENU_TEXT_COLOR)
             
             screen.blit(rank_text, (SCREEN_WIDTH // 2 - 200, start_y + i * 40))
             screen.blit(name_text, (SCREEN_WIDTH // 2 - 140, start_y + i * 40))
@@ -934,79 +1236,60 @@ def draw_high_scores(screen, font, large_font, high_scores):
             screen.blit(date_text, (SCREEN_WIDTH // 2 + 140, start_y + i * 40))
     
     # Instruções
-    instructions = font.render("Pressione ESC para voltar ao menu", True, MENU_TEXT_COLOR)
+    instructions = TEXT_CACHE.render(font, "Pressione ESC para voltar ao menu", MENU_TEXT_COLOR)
     screen.blit(instructions, (SCREEN_WIDTH // 2 - instructions.get_width() // 2, SCREEN_HEIGHT - 50))
-    
-    pygame.display.flip()
 
-def get_player_names(screen, font, large_font):
-    """Tela para inserir nomes dos jogadores"""
-    player1_name = ""
-    player2_name = ""
-    current_player = 0  # 0 para jogador 1, 1 para jogador 2
+@functools.lru_cache(maxsize=1)
+def get_victory_font():
+    """Fonte grande da mensagem de vitória (carregada uma vez, e sempre o
+    mesmo objeto, para o cache de textos)"""
+    return pygame.font.SysFont(None, 72)
+
+def draw_victory(screen, loser_text, winner_text, winner_color):
+    """Desenha a mensagem de fim de partida sobre a tela atual"""
+    victory_font = get_victory_font()
+    loser_surf = TEXT_CACHE.render(victory_font, loser_text, (255, 50, 50))
+    winner_surf = TEXT_CACHE.render(victory_font, winner_text, winner_color)
+    screen.blit(loser_surf, (SCREEN_WIDTH // 2 - loser_surf.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
+    screen.blit(winner_surf, (SCREEN_WIDTH // 2 - winner_surf.get_width() // 2, SCREEN_HEIGHT // 2 - 20))
+
+def draw_name_input(screen, font, large_font, player1_name, player2_name, current_player,
+                    vs_cpu=False, difficulty_index=0):
+    """Desenha a tela para inserir nomes dos jogadores.
+    Contra a CPU, o segundo campo mostra a dificuldade escolhida."""
+    screen.fill(MENU_BG_COLOR)
     
-    done = False
+    title = TEXT_CACHE.render(large_font, "Insira os nomes dos jogadores", MENU_TITLE_COLOR)
+    screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 100))
     
-    while not done:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return None, None
-            
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    if current_player == 0:
-                        if player1_name.strip():  # Garantir que não seja vazio
-                            current_player = 1
-                    else:
-                        if player2_name.strip():  # Garantir que não seja vazio
-                            done = True
-                            
-                elif event.key == pygame.K_BACKSPACE:
-                    if current_player == 0:
-                        player1_name = player1_name[:-1]
-                    else:
-                        player2_name = player2_name[:-1]
-                        
-                elif event.key == pygame.K_ESCAPE:
-                    return None, None
-                    
-                else:
-                    # Adicionar caractere (limitar a 15 caracteres)
-                    if event.unicode.isprintable():
-                        if current_player == 0 and len(player1_name) < 15:
-                            player1_name += event.unicode
-                        elif current_player == 1 and len(player2_name) < 15:
-                            player2_name += event.unicode
-        
-        # Desenhar tela de entrada de nomes
-        screen.fill(MENU_BG_COLOR)
-        
-        title = large_font.render("Insira os nomes dos jogadores", True, MENU_TITLE_COLOR)
-        screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 100))
-        
-        # Jogador 1
-        p1_label = font.render("Jogador 1 (Vermelho):", True, MONKEY_COLORS[0])
-        p1_text = font.render(player1_name + ("_" if current_player == 0 else ""), True, MENU_TEXT_COLOR)
-        screen.blit(p1_label, (SCREEN_WIDTH // 2 - 200, 250))
-        screen.blit(p1_text, (SCREEN_WIDTH // 2 - 200, 290))
-        
-        # Jogador 2
-        p2_label = font.render("Jogador 2 (Azul):", True, MONKEY_COLORS[1])
-        p2_text = font.render(player2_name + ("_" if current_player == 1 else ""), True, MENU_TEXT_COLOR)
-        screen.blit(p2_label, (SCREEN_WIDTH // 2 - 200, 350))
-        screen.blit(p2_text, (SCREEN_WIDTH // 2 - 200, 390))
-        
-        # Instruções
-        instructions = font.render("Pressione ENTER para confirmar, ESC para voltar", True, MENU_TEXT_COLOR)
-        screen.blit(instructions, (SCREEN_WIDTH // 2 - instructions.get_width() // 2, SCREEN_HEIGHT - 50))
-        
-        pygame.display.flip()
+    # Jogador 1
+    p1_label = TEXT_CACHE.render(font, "Jogador 1 (Vermelho):", MONKEY_COLORS[0])
+    p1_text = TEXT_CACHE.render(font, player1_name + ("_" if current_player == 0 else ""), MENU_TEXT_COLOR)
+    screen.blit(p1_label, (SCREEN_WIDTH // 2 - 200, 250))
+    screen.blit(p1_text, (SCREEN_WIDTH // 2 - 200, 290))
+    
+    # Jogador 2
+    if vs_cpu:
+        p2_label = TEXT_CACHE.render(font, "CPU (Azul) - dificuldade (ESQ/DIR):", MONKEY_COLORS[1])
+        difficulty_label = DIFFICULTIES[DIFFICULTY_ORDER[difficulty_index]].label
+        p2_text = TEXT_CACHE.render(font, f"< {difficulty_label} >" if current_player == 1 else difficulty_label,
+                                    MENU_TEXT_COLOR)
+    else:
+        p2_label = TEXT_CACHE.render(font, "Jogador 2 (Azul):", MONKEY_COLORS[1])
+        p2_text = TEXT_CACHE.render(font, player2_name + ("_" if current_player == 1 else ""), MENU_TEXT_COLOR)
+    screen.blit(p2_label, (SCREEN_WIDTH // 2 - 200, 350))
+    screen.blit(p2_text, (SCREEN_WIDTH // 2 - 200, 390))
     
-    return player1_name, player2_name
+    # Instruções
+    instructions = TEXT_CACHE.render(font, "Pressione ENTER para confirmar, ESC para voltar", MENU_TEXT_COLOR)
+    screen.blit(instructions, (SCREEN_WIDTH // 2 - instructions.get_width() // 2, SCREEN_HEIGHT - 50))
 
 # Função para salvar o estado atual do jogo
-def save_current_game(buildings, scores, turn, player_pos, player_names):
-    """Salva o estado atual do jogo"""
+def save_current_game(buildings, scores, turn, player_pos, player_names, cpu_difficulty=None, seed=None,
+                      player_health=None, wind=None, replay_id=None):
+    """Salva o estado atual do jogo.
+    Com a semente, as crateras vão para um arquivo binário de máscaras ao lado do JSON.
+    replay_id liga o jogo salvo à partida gravada, que continua ao carregá-lo."""
     # Converter objetos Rect para dicionários serializáveis
     serializable_buildings = []
     for b in buildings:
@@ -1041,10 +1324,37 @@ def save_current_game(buildings, scores, turn, player_pos, player_names):
         'turn': turn,
         'player_positions': player_pos,
         'player_names': player_names,
-        'gravity': GRAVITY
+        'cpu_difficulty': cpu_difficulty,
+        'seed': seed,
+        'player_health': player_health,
+        'wind': wind,
+        'gravity': GRAVITY,
+        'replay_id': replay_id
     }
     
     game_storage.save_game_state(game_state)
+    if seed is not None:
+        for b in buildings:
+            if b.get("solid") is None:
+                init_building_integrity(b)
+        game_storage.save_damage_masks(seed, [b["solid"] for b in buildings])
+
+def restore_building_damage(buildings, masks):
+    """Reabre nos prédios recém-gerados as crateras das máscaras salvas.
+    Retorna False (sem alterar nada) se as máscaras não correspondem aos prédios."""
+    if masks is None or len(masks) != len(buildings):
+        return False
+    if any(mask.shape != b["rect"].size for mask, b in zip(masks, buildings)):
+        return False
+    for mask, b in zip(masks, buildings):
+        if mask.all():
+            continue
+        # As crateras zeram o RGBA do pixel, como carve_crater
+        pixels = pygame.surfarray.pixels2d(b["surf"])
+        pixels[~mask] = 0
+        del pixels
+        init_building_integrity(b)
+    return True
 
 # Função para carregar o jogo salvo
 def load_saved_game():
@@ -1057,6 +1367,23 @@ def load_saved_game():
     for b in state['buildings']:
         rect_dict = b['rect']
         b['rect'] = pygame.Rect(rect_dict['x'], rect_dict['y'], rect_dict['width'], rect_dict['height'])
+
+    seed = state.get('seed')
+    if seed is not None:
+        # Cenário reconstruído pela semente, com as crateras das máscaras salvas
+        background, buildings = build_world(seed)
+        restore_building_damage(buildings, game_storage.load_damage_masks(seed))
+        for b, saved in zip(buildings, state['buildings']):
+            if saved.get('collapsed'):
+                b['collapsed'] = True
+        state['background'], state['buildings'] = background, buildings
+    else:
+        # Jogo salvo sem semente: prédios lisos na cor salva sobre um fundo novo
+        for b in state['buildings']:
+            b['surf'] = pygame.Surface(b['rect'].size, pygame.SRCALPHA)
+            b['surf'].fill(b.get('color', BUILDING_COLOR))
+            init_building_integrity(b)
+        state['background'] = create_background()
     
     # Atualizar variável global GRAVITY
     global GRAVITY
@@ -1064,50 +1391,24 @@ def load_saved_game():
     
     return state
 
-def main():
-    # Declarar que vamos usar a variável global GRAVITY
-    global GRAVITY
-    
-    pygame.init()
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption("Gorillas 2.0")
-    clock = pygame.time.Clock()
-    
-    # Carregar fontes
-    font = pygame.font.SysFont(None, 28)
-    large_font = pygame.font.SysFont(None, 48)
-    
-    # Estado atual do jogo (começa no menu)
-    game_state = GAME_STATE_MENU
-    selected_menu_option = MENU_NEW_GAME
-    
-    # Verificar se existe jogo salvo
-    has_saved_game = game_storage.load_game_state() is not None
-    
-    # Carregar recordes
-    high_scores = game_storage.load_high_scores()
-    
-    # Variáveis para o jogo
-    buildings = None
-    player_pos = None
-    scores = [0, 0]
-    turn = 0
-    banana = None
-    explosion = None
-    angle = 45
-    power = 50
-    wind = random.randint(-10, 10)
-    
-    # Nomes dos jogadores
-    player_names = ["Jogador 1", "Jogador 2"]
-    
-    # Saúde dos gorilas
-    player_health = [MAX_GORILLA_HEALTH, MAX_GORILLA_HEALTH]
-    
-    # Criar fundo do jogo uma única vez
-    background = create_background()
+# Quadros por segundo das telas paradas (menu, nomes, recordes, vitória)
+IDLE_FPS = 30
+# Tempo da mensagem de vitória antes de voltar ao menu
+VICTORY_DURATION = 3.0
 
-    # Load gorilla sprites; fallback to primitive drawing if not found
+# Tela, relógio e fontes compartilhados pelas cenas
+UI = namedtuple("UI", ["screen", "clock", "font", "large_font", "profiler_font"])
+
+def present_full_frame(ui):
+    """Filtra e envia à tela um quadro desenhado por inteiro (telas fora da partida)"""
+    with PROFILER.stage("apply_comic_filter"):
+        apply_comic_filter(ui.screen)
+    PROFILER.draw_overlay(ui.screen, ui.profiler_font, ui.clock.get_fps())
+    with PROFILER.stage("flip"):
+        pygame.display.flip()
+
+def load_gorilla_sprites():
+    """Sprites dos gorilas; None para os que não existirem (desenho primitivo)"""
     gorilla_sprites = []
     for path in GORILLA_SPRITE_PATHS:
         try:
@@ -1116,371 +1417,568 @@ def main():
         except Exception:
             sprite = None
         gorilla_sprites.append(sprite)
-
-    def setup_new_game():
-        nonlocal buildings, player_pos, scores, turn, angle, power, wind, banana, explosion, player_health
-        
-        # Gerar novos prédios
-        buildings = generate_buildings()
-        
-        # Posicionar jogadores em prédios mais centrais
-        if len(buildings) >= 5:
-            p1_building_index = 2  # Terceiro prédio da esquerda
-            p2_building_index = -3  # Terceiro prédio da direita
-        elif len(buildings) >= 3:
-            p1_building_index = 1
-            p2_building_index = -2
-        else:  # Caso extremo com poucos prédios
-            p1_building_index = 0
-            p2_building_index = -1
-
-        p1_rect = buildings[p1_building_index]["rect"]
-        p2_rect = buildings[p2_building_index]["rect"]
-
-        # Ajustar a altura Y para os gorilas sobre os prédios
-        offset_y_para_pes_no_predio = MONKEY_RADIUS * 1.5
-
-        player_pos = [
-            (p1_rect.centerx, p1_rect.top - offset_y_para_pes_no_predio),
-            (p2_rect.centerx, p2_rect.top - offset_y_para_pes_no_predio),
-        ]
+    return gorilla_sprites
+
+class MenuScene(Scene):
+    """Menu principal"""
+    idle = True
+    fps = IDLE_FPS
+
+    def __init__(self, ui):
+        super().__init__()
+        self.ui = ui
+        self.selected_option = MENU_NEW_GAME
+        self.has_saved_game = False
+
+    def enter(self, **kwargs):
+        super().enter()
+        # Verificar se existe jogo salvo (inclui gravações ainda na fila)
+        self.has_saved_game = game_storage.load_game_state() is not None
+
+    def handle_event(self, event):
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_UP:
+            self.selected_option = (self.selected_option - 1) % MENU_OPTION_COUNT
+            self.dirty = True
+        elif event.key == pygame.K_DOWN:
+            self.selected_option = (self.selected_option + 1) % MENU_OPTION_COUNT
+            self.dirty = True
+        elif event.key == pygame.K_RETURN:
+            if self.selected_option in (MENU_NEW_GAME, MENU_NEW_GAME_CPU):
+                self.switch(GAME_STATE_NAME_INPUT, vs_cpu=self.selected_option == MENU_NEW_GAME_CPU)
+            elif self.selected_option == MENU_CONTINUE and self.has_saved_game:
+                state = load_saved_game()
+                if state is not None:
+                    self.switch(GAME_STATE_PLAYING, saved_state=state)
+            elif self.selected_option == MENU_HIGH_SCORES:
+                self.switch(GAME_STATE_HIGH_SCORES)
+            elif self.selected_option == MENU_QUIT:
+                self.machine.stop()
+
+    def render(self):
+        draw_menu(self.ui.screen, self.ui.font, self.ui.large_font, self.selected_option, self.has_saved_game)
+        present_full_frame(self.ui)
+
+class NameInputScene(Scene):
+    """Entrada dos nomes dos jogadores (e da dificuldade, contra a CPU)"""
+    idle = True
+    fps = IDLE_FPS
+
+    def __init__(self, ui):
+        super().__init__()
+        self.ui = ui
+        self.enter()
+
+    def enter(self, vs_cpu=False, **kwargs):
+        super().enter()
+        self.vs_cpu = vs_cpu
+        self.player1_name = ""
+        self.player2_name = ""
+        self.current_player = 0  # 0 para jogador 1, 1 para jogador 2
+        self.difficulty_index = DIFFICULTY_ORDER.index("medio")
+
+    def handle_event(self, event):
+        if event.type != pygame.KEYDOWN:
+            return
+        self.dirty = True
+        if event.key == pygame.K_RETURN:
+            if self.current_player == 0:
+                if self.player1_name.strip():  # Garantir que não seja vazio
+                    self.current_player = 1
+            elif self.vs_cpu:
+                difficulty = DIFFICULTY_ORDER[self.difficulty_index]
+                self.switch(GAME_STATE_PLAYING, cpu_difficulty=difficulty,
+                            player_names=[self.player1_name, f"CPU ({DIFFICULTIES[difficulty].label})"])
+            elif self.player2_name.strip():  # Garantir que não seja vazio
+                self.switch(GAME_STATE_PLAYING, player_names=[self.player1_name, self.player2_name])
+
+        elif self.vs_cpu and self.current_player == 1 and event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+            step = 1 if event.key == pygame.K_RIGHT else -1
+            self.difficulty_index = (self.difficulty_index + step) % len(DIFFICULTY_ORDER)
+
+        elif event.key == pygame.K_BACKSPACE:
+            if self.current_player == 0:
+                self.player1_name = self.player1_name[:-1]
+            else:
+                self.player2_name = self.player2_name[:-1]
+
+        elif event.key == pygame.K_ESCAPE:
+            self.switch(GAME_STATE_MENU)
+
+        # Adicionar caractere (limitar a 15 caracteres)
+        elif event.unicode.isprintable():
+            if self.current_player == 0 and len(self.player1_name) < 15:
+                self.player1_name += event.unicode
+            elif self.current_player == 1 and not self.vs_cpu and len(self.player2_name) < 15:
+                self.player2_name += event.unicode
+
+    def render(self):
+        draw_name_input(self.ui.screen, self.ui.font, self.ui.large_font, self.player1_name, self.player2_name,
+                        self.current_player, self.vs_cpu, self.difficulty_index)
+        present_full_frame(self.ui)
+
+class HighScoresScene(Scene):
+    """Tela de recordes"""
+    idle = True
+    fps = IDLE_FPS
+
+    def __init__(self, ui):
+        super().__init__()
+        self.ui = ui
+        self.high_scores = []
+
+    def enter(self, **kwargs):
+        super().enter()
+        # Lista mantida em memória pelo banco de pontuações
+        self.high_scores = game_storage.load_high_scores()
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.switch(GAME_STATE_MENU)
+
+    def render(self):
+        draw_high_scores(self.ui.screen, self.ui.font, self.ui.large_font, self.high_scores)
+        present_full_frame(self.ui)
+
+class GameOverScene(Scene):
+    """Mensagem de vitória sobre o último quadro da partida, depois o menu"""
+    idle = True
+    fps = IDLE_FPS
+
+    def __init__(self, ui):
+        super().__init__()
+        self.ui = ui
+        self.backdrop = None
+
+    def enter(self, loser_text="", winner_text="", winner_color=MENU_TEXT_COLOR, **kwargs):
+        super().enter()
+        self.backdrop = self.ui.screen.copy()
+        self.messages = (loser_text, winner_text, winner_color)
+        self.elapsed = 0.0
+
+    def exit(self):
+        self.backdrop = None
+
+    def update(self, dt):
+        self.elapsed += dt
+        if self.elapsed >= VICTORY_DURATION:
+            self.switch(GAME_STATE_MENU)
+
+    def render(self):
+        self.ui.screen.blit(self.backdrop, (0, 0))
+        draw_victory(self.ui.screen, *self.messages)
+        PROFILER.draw_overlay(self.ui.screen, self.ui.profiler_font, self.ui.clock.get_fps())
+        with PROFILER.stage("flip"):
+            pygame.display.flip()
+
+class PlayingScene(Scene):
+    """Partida em andamento: controles, CPU, física da banana e desenho por áreas sujas"""
+
+    def __init__(self, ui, ai_executor, seed=None):
+        super().__init__()
+        self.ui = ui
+        # Semente do cenário da primeira partida (None = aleatória)
+        self.next_world_seed = seed
+        self.world_seed = None
+        self.background = None
+        self.buildings = None
+        self.skyline = None
+        self.player_pos = None
+        self.player_names = ["Jogador 1", "Jogador 2"]
+        self.scores = [0, 0]
+        self.turn = 0
+        self.angle = 45
+        self.power = 50
+        self.wind = random.randint(-10, 10)
+        self.banana = None
+        self.explosion = None
+        # Saúde dos gorilas
+        self.player_health = [MAX_GORILLA_HEALTH, MAX_GORILLA_HEALTH]
+        # Oponente controlado pelo computador (jogador 2), se houver. A busca
+        # roda numa thread de trabalho; o loop só consulta o resultado
+        self.cpu_player = None
+        self.ai_executor = ai_executor
+        self.ai_future = None
+        self.ai_cancel = None
+        # Incrementado a cada dano no cenário (chave do cache da IA)
+        self.world_version = 0
+        # Cenário (fundo + prédios) composto e filtrado uma vez por partida;
+        # depois, só as áreas atingidas são recompostas
+        self.renderer = DirtyRenderer(ui.screen, COMIC_FILTER)
+        self.world_layer_buildings = None
+        self.world_damage = []
+        # Entradas de cada lançamento, gravadas para assistir à partida depois
+        self.replay_recorder = replay.ReplayRecorder()
+        # Acumulador da física em passo fixo
+        self.physics_stepper = physics.FixedStepper()
+        self.gorilla_sprites = load_gorilla_sprites()
+
+    def enter(self, player_names=None, cpu_difficulty=None, saved_state=None, **kwargs):
+        super().enter()
+        if saved_state is not None:
+            self.load_game(saved_state)
+        elif player_names is not None:
+            self.cpu_player = ComputerPlayer(cpu_difficulty) if cpu_difficulty else None
+            self.player_names = list(player_names)
+            self.new_game()
+        # Vindo de uma tela desenhada por inteiro: o primeiro quadro é completo
+        self.renderer.invalidate()
+
+    def exit(self):
+        self.cancel_ai()
+
+    def quit(self):
+        # Salvar o jogo em andamento ao fechar a janela
+        self.cancel_ai()
+        if self.buildings and self.player_pos:
+            self.save_game()
+
+    def cancel_ai(self):
+        """Abandona a busca da CPU em andamento (a thread para na próxima fatia)"""
+        if self.ai_cancel is not None:
+            self.ai_cancel.set()
+        self.ai_future = None
+        self.ai_cancel = None
+
+    def new_game(self):
+        """Gera (ou carrega do cache) o cenário da semente e reinicia a partida"""
+        self.cancel_ai()
+        self.world_seed = self.next_world_seed if self.next_world_seed is not None else new_world_seed()
+        self.next_world_seed = None
+        self.background, self.buildings = build_world(self.world_seed)
+        self.skyline = Skyline(self.buildings, SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.world_version += 1
+        self.replay_recorder.start_match(self.world_seed, (SCREEN_WIDTH, SCREEN_HEIGHT),
+                                         WORLD_GENERATOR_VERSION, self.player_names)
+        self.player_pos = place_players(self.buildings)
 
         # Resetar valores do jogo
-        scores = [0, 0]
-        turn = 0
-        angle = 45
-        power = 50
-        wind = random.randint(-10, 10)
-        banana = None
-        explosion = None
-        player_health = [MAX_GORILLA_HEALTH, MAX_GORILLA_HEALTH]  # Inicializar saúde dos gorilas
-        
-        return buildings, player_pos, scores, turn, angle, power, wind, banana, explosion, player_health
-
-    # Iniciar no menu principal
-    if has_saved_game:
-        saved_state = load_saved_game()
-    else:
-        saved_state = None
-        
-    # Loop principal do jogo
-    running = True
-    while running:
-        dt = clock.tick(FPS) / 1000.0
-        
-        # Verificação de eventos
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                # Salvar o jogo se estiver em andamento
-                if game_state == GAME_STATE_PLAYING and buildings and player_pos:
-                    save_current_game(buildings, scores, turn, player_pos, player_names)
-                running = False
+        self.scores = [0, 0]
+        self.turn = 0
+        self.angle = 45
+        self.power = 50
+        self.wind = random.randint(-10, 10)
+        self.banana = None
+        self.explosion = None
+        self.player_health = [MAX_GORILLA_HEALTH, MAX_GORILLA_HEALTH]  # Inicializar saúde dos gorilas
+
+    def load_game(self, state):
+        """Continua o jogo salvo (estado de load_saved_game)"""
+        self.cancel_ai()
+        self.world_seed = state.get('seed')
+        self.background, self.buildings = state['background'], state['buildings']
+        self.skyline = Skyline(self.buildings, SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.world_version += 1
+        self.scores = state['scores']
+        self.turn = state['turn']
+        self.player_pos = state['player_positions']
+        self.player_names = state.get('player_names', ["Jogador 1", "Jogador 2"])
+        cpu_difficulty = state.get('cpu_difficulty')
+        self.cpu_player = ComputerPlayer(cpu_difficulty) if cpu_difficulty in DIFFICULTIES else None
+        self.replay_recorder.resume_match(state.get('replay_id'))
+        self.player_health = state.get('player_health') or [MAX_GORILLA_HEALTH, MAX_GORILLA_HEALTH]
+        # Inicializar outros valores
+        self.angle = 45
+        self.power = 50
+        self.wind = state.get('wind')
+        if self.wind is None:
+            self.wind = random.randint(-10, 10)
+        self.banana = None
+        self.explosion = None
+
+    def save_game(self):
+        save_current_game(self.buildings, self.scores, self.turn, self.player_pos, self.player_names,
+                          self.cpu_player.difficulty if self.cpu_player else None, self.world_seed,
+                          self.player_health, self.wind, self.replay_recorder.match_id)
+
+    def launch(self):
+        """Lança a banana do jogador da vez com o ângulo e a força atuais"""
+        self.banana = new_banana(self.player_pos[self.turn], self.turn, self.angle, self.power)
+        # Gravado no replay só quando a banana cai (ver step_banana): um
+        # lançamento interrompido por ESC ou ao fechar a janela não conta
+        self.banana["shot"] = (self.turn, self.angle, self.power, self.wind, GRAVITY)
+        self.physics_stepper.reset()
+
+    def handle_event(self, event):
+        global GRAVITY
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_ESCAPE:
+            # Salvar o jogo antes de ir para o menu (a busca da CPU é cancelada ao sair)
+            self.save_game()
+            self.switch(GAME_STATE_MENU)
+        elif self.banana is None and self.explosion is None and not (self.cpu_player and self.turn == 1):
+            if event.key == pygame.K_UP:
+                self.angle = min(self.angle + 1, 180)
+            elif event.key == pygame.K_DOWN:
+                self.angle = max(self.angle - 1, 0)
+            elif event.key == pygame.K_RIGHT:
+                self.power = min(self.power + 1, 100)
+            elif event.key == pygame.K_LEFT:
+                self.power = max(self.power - 1, 0)
+            elif event.key == pygame.K_r:
+                self.wind = random.randint(-10, 10)
+            # Controles para modificar a gravidade
+            elif event.key == pygame.K_g:
+                GRAVITY += 50  # Incremento adequado para o sistema 2D
+            elif event.key == pygame.K_h:
+                GRAVITY = max(50, GRAVITY - 50)  # Impede gravidade muito baixa
+            elif event.key == pygame.K_t:
+                GRAVITY = 300  # Restaura para o valor padrão do jogo
+            elif event.key == pygame.K_SPACE:
+                self.launch()
+
+    def update(self, dt):
+        # Vez da CPU: a busca roda em segundo plano; aqui só se consulta o resultado
+        if self.cpu_player and self.turn == 1 and self.banana is None and self.explosion is None:
+            if self.ai_future is None:
+                self.ai_cancel = threading.Event()
+                self.ai_future = self.ai_executor.submit(
+                    self.cpu_player.plan, self.buildings, self.player_pos, self.world_version,
+                    self.wind, GRAVITY, self.turn, SIM_RULES, self.ai_cancel)
+            elif self.ai_future.done():
+                future, self.ai_future, self.ai_cancel = self.ai_future, None, None
+                try:
+                    choice = future.result()
+                except Exception as e:
+                    # Erro na thread da busca: a CPU ainda joga, para a partida não travar
+                    print(f"Erro na busca da CPU: {e!r}", file=sys.stderr)
+                    choice = None
+                # Uma busca cancelada nunca chega aqui (cancel_ai descarta o
+                # futuro); sem resultado, usar o lançamento padrão em vez de
+                # repetir a mesma busca a cada quadro
+                self.angle, self.power = choice if choice is not None else AI_FALLBACK_SHOT
+                self.launch()
+
+        # Lógica da banana (física em passo fixo, independente do FPS)
+        steps = self.physics_stepper.advance(dt) if self.banana else 0
+        for _ in range(steps):
+            if self.banana is None or self.machine.current is not self:
+                break
+            self.step_banana()
+
+        # Lógica de explosão
+        if self.explosion:
+            self.explosion["timer"] += dt
+            if self.explosion["timer"] > EXPLOSION_DURATION:
+                # Remover apenas a explosão, sem lógica adicional
+                # A partida só termina quando acerta um gorila
+                self.explosion = None
+
+    def step_banana(self):
+        """Um passo de física da banana, com colisão contínua e suas consequências"""
+        banana = self.banana
+        player_pos = self.player_pos
+        # Atualizar contador de tempo de vida e física
+        banana["time_alive"] += physics.PHYSICS_DT
+        banana["prev_pos"][:] = banana["pos"]
+        with PROFILER.stage("physics"):
+            physics.step(banana["pos"], banana["vel"], self.wind * WIND_FACTOR, GRAVITY)
+        banana["trail"].append((banana["pos"][0], banana["pos"][1]))
+
+        # Colisão contínua: testar o segmento percorrido neste passo
+        owner = banana["owner"]
+        targets = [(1 - owner, player_pos[1 - owner])]
+        # Colisão com o próprio gorila (autodestruição) só após 0.5 segundos
+        if banana["time_alive"] > 0.5:
+            targets.append((owner, player_pos[owner]))
+        with PROFILER.stage("collision"):
+            hit = collision.sweep(banana["prev_pos"], banana["pos"], self.buildings,
+                                  targets, BANANA_RADIUS + MONKEY_RADIUS, self.skyline)
+
+        if hit is None:
+            x, y = banana["pos"]
+            # Verificar se a banana saiu da tela
+            if x < 0 or x > SCREEN_WIDTH or y > SCREEN_HEIGHT:
+                self.replay_recorder.record_shot(*banana["shot"])
+                self.banana = None
+                self.turn = 1 - self.turn
+                self.wind = random.randint(-10, 10)
+            return
+
+        self.replay_recorder.record_shot(*banana["shot"])
+        x, y = hit.x, hit.y
+        self.explosion = {"pos": (x, y), "timer": 0}
+        self.banana = None
+
+        if hit.kind == "building":
+            b = self.buildings[hit.index]
+            # Verificar se o prédio vai desabar após o dano
+            with PROFILER.stage("damage_building"):
+                building_collapse = damage_building(b, (x, y), EXPLOSION_RADIUS)
+            self.skyline.refresh(hit.index)
+            self.world_version += 1
+            self.world_damage.append(pygame.Rect(int(x) - EXPLOSION_RADIUS, int(y) - EXPLOSION_RADIUS,
+                                                 EXPLOSION_RADIUS * 2 + 1, EXPLOSION_RADIUS * 2 + 1))
             
-            # Processamento de eventos de acordo com o estado do jogo
-            if game_state == GAME_STATE_MENU:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_UP:
-                        selected_menu_option = (selected_menu_option - 1) % 4
-                    elif event.key == pygame.K_DOWN:
-                        selected_menu_option = (selected_menu_option + 1) % 4
-                    elif event.key == pygame.K_RETURN:
-                        if selected_menu_option == MENU_NEW_GAME:
-                            game_state = GAME_STATE_NAME_INPUT
-                        elif selected_menu_option == MENU_CONTINUE and has_saved_game:
-                            # Carregar jogo salvo
-                            state = load_saved_game()
-                            buildings = state['buildings']
-                            scores = state['scores']
-                            turn = state['turn']
-                            player_pos = state['player_positions']
-                            player_names = state.get('player_names', ["Jogador 1", "Jogador 2"])
-                            # Inicializar outros valores
-                            angle = 45
-                            power = 50
-                            wind = random.randint(-10, 10)
-                            banana = None
-                            explosion = None
-                            # Mudar para o estado de jogo
-                            game_state = GAME_STATE_PLAYING
-                        elif selected_menu_option == MENU_HIGH_SCORES:
-                            game_state = GAME_STATE_HIGH_SCORES
-                        elif selected_menu_option == MENU_QUIT:
-                            running = False
+            if building_collapse:
+                # Prédio desabando!
+                # Verificar se algum gorila está no prédio que está desabando
+                for player_idx, pos in enumerate(player_pos):
+                    if b["rect"].collidepoint(pos[0], pos[1]):
+                        # Gorila está no prédio que desabou - sofre dano
+                        self.player_health[player_idx] -= DAMAGE_BUILDING_COLLAPSE
+                        # Criar explosão secundária na posição do gorila
+                        self.explosion = {"pos": pos, "timer": 0}
+                
+                # Remover o prédio do jogo
+                b["collapsed"] = True
+                self.world_damage.append(b["rect"])
             
-            elif game_state == GAME_STATE_HIGH_SCORES:
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                    game_state = GAME_STATE_MENU
+            self.wind = random.randint(-10, 10)
+            self.turn = 1 - self.turn
+            return
+
+        # Acertou um gorila
+        target_idx = hit.index
+        if target_idx == owner:
+            # Fazer o dano por auto-destruição ser maior (dano x 1.5)
+            self.player_health[target_idx] -= int(DAMAGE_PER_HIT * 1.5)
+            winner_idx = 1 - owner
+        else:
+            self.player_health[target_idx] -= DAMAGE_PER_HIT
+            winner_idx = owner
+
+        # Verificar se o gorila foi derrotado (energia <= 0)
+        if self.player_health[target_idx] <= 0:
+            # Gorila derrotado! O vencedor ganha ponto
+            self.scores[winner_idx] += 1
             
-            elif game_state == GAME_STATE_NAME_INPUT:
-                # Lógica para entrada de nomes é tratada na função get_player_names
-                player1_name, player2_name = get_player_names(screen, font, large_font)
-                if player1_name is not None and player2_name is not None:
-                    player_names = [player1_name, player2_name]
-                    # Inicializar novo jogo
-                    buildings, player_pos, scores, turn, angle, power, wind, banana, explosion, player_health = setup_new_game()
-                    game_state = GAME_STATE_PLAYING
-                else:
-                    game_state = GAME_STATE_MENU
+            # Salvar recordes
+            players_scores = [
+                {"name": self.player_names[0], "score": self.scores[0]},
+                {"name": self.player_names[1], "score": self.scores[1]}
+            ]
+            game_storage.save_high_scores(players_scores)
+            self.replay_recorder.end_match(winner_idx)
             
-            elif game_state == GAME_STATE_PLAYING:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        # Salvar o jogo antes de ir para o menu
-                        save_current_game(buildings, scores, turn, player_pos, player_names)
-                        game_state = GAME_STATE_MENU
-                    elif banana is None and explosion is None:
-                        if event.key == pygame.K_UP:
-                            angle = min(angle + 1, 180)
-                        elif event.key == pygame.K_DOWN:
-                            angle = max(angle - 1, 0)
-                        elif event.key == pygame.K_RIGHT:
-                            power = min(power + 1, 100)
-                        elif event.key == pygame.K_LEFT:
-                            power = max(power - 1, 0)
-                        elif event.key == pygame.K_r:
-                            wind = random.randint(-10, 10)
-                        # Controles para modificar a gravidade
-                        elif event.key == pygame.K_g:
-                            GRAVITY += 50  # Incremento adequado para o sistema 2D
-                        elif event.key == pygame.K_h:
-                            GRAVITY = max(50, GRAVITY - 50)  # Impede gravidade muito baixa
-                        elif event.key == pygame.K_t:
-                            GRAVITY = 300  # Restaura para o valor padrão do jogo
-                        elif event.key == pygame.K_SPACE:
-                            # Calcula ângulo de lançamento (inverte para o segundo jogador)
-                            theta = math.radians(angle if turn == 0 else 180 - angle)
-                            
-                            # Velocidade inicial baseada na potência selecionada
-                            speed = power * VEL_FACTOR
-                            
-                            # Calcula componentes da velocidade
-                            vx = math.cos(theta) * speed
-                            vy = -math.sin(theta) * speed  # Negativo porque Y aumenta para baixo
-                            
-                            # Adiciona deslocamento inicial para evitar colisão imediata
-                            start_pos = list(player_pos[turn])
-                            offset_x = math.cos(theta) * (MONKEY_RADIUS + BANANA_RADIUS + 5)
-                            offset_y = -math.sin(theta) * (MONKEY_RADIUS + BANANA_RADIUS + 5)
-                            start_pos[0] += offset_x
-                            start_pos[1] += offset_y
-                            
-                            banana = {
-                                "pos": start_pos, 
-                                "vel": [vx, vy],
-                                "owner": turn,
-                                "time_alive": 0
-                            }
+            # Exibir mensagem de vitória (e depois voltar para o menu principal)
+            if target_idx == owner:
+                loser_text = f"{self.player_names[target_idx]} destruiu a si mesmo!"
+            else:
+                loser_text = f"{self.player_names[target_idx]} ficou sem energia!"
+            winner_text = f"{self.player_names[winner_idx]} venceu!"
+            self.switch(GAME_STATE_GAME_OVER, loser_text=loser_text, winner_text=winner_text,
+                        winner_color=MONKEY_COLORS[winner_idx])
+        else:
+            # Gorila ainda tem energia, continuar o jogo
+            self.wind = random.randint(-10, 10)
+            self.turn = 1 - self.turn
+
+    def render(self):
+        screen, font, renderer = self.ui.screen, self.ui.font, self.renderer
+        player_pos, player_health, player_names = self.player_pos, self.player_health, self.player_names
+        # Jogo em andamento: só as áreas que mudaram são redesenhadas
+        with PROFILER.stage("buildings"):
+            if self.world_layer_buildings is not self.buildings:
+                # Nova partida ou jogo carregado: compor o cenário inteiro
+                renderer.set_static(compose_world(self.background, self.buildings))
+                self.world_layer_buildings = self.buildings
+            elif self.world_damage:
+                for area in self.world_damage:
+                    renderer.update_static(recompose_world_area(renderer.static, self.background,
+                                                                self.buildings, area))
+            self.world_damage.clear()
+        with PROFILER.stage("background"):
+            renderer.begin_frame()
         
-        # Atualização da lógica do jogo baseada no estado atual
-        if game_state == GAME_STATE_PLAYING:
-            # Lógica da banana
-            if banana:
-                # Atualizar contador de tempo de vida e física
-                banana["time_alive"] += dt
-                banana["vel"][0] += wind * WIND_FACTOR * dt
-                banana["vel"][1] += GRAVITY * dt
-                banana["pos"][0] += banana["vel"][0] * dt
-                banana["pos"][1] += banana["vel"][1] * dt
-
-                x, y = banana["pos"]
-                # Verificar se a banana saiu da tela
-                if x < 0 or x > SCREEN_WIDTH or y > SCREEN_HEIGHT:
-                    banana = None
-                    turn = 1 - turn
-                    wind = random.randint(-10, 10)
+        # Desenhar gorilas: sprite se disponível, ou versão primitiva
+        with PROFILER.stage("monkey"):
+            for idx, sprite in enumerate(self.gorilla_sprites):
+                if sprite:
+                    renderer.blit(sprite, sprite.get_rect(center=player_pos[idx]))
+                    # Adicionar barra de energia acima do sprite
+                    renderer.mark(draw_health_bar(screen, player_pos[idx], player_health[idx], MAX_GORILLA_HEALTH))
                 else:
-                    # Verificar colisão com os prédios
-                    for i, b in enumerate(buildings):
-                        if b["rect"].collidepoint(x, y):
-                            explosion = {"pos": (x, y), "timer": 0}
-                            # Verificar se o prédio vai desabar após o dano
-                            building_collapse = damage_building(b, (x, y), EXPLOSION_RADIUS)
-                            
-                            if building_collapse:
-                                # Prédio desabando!
-                                # Verificar se algum gorila está no prédio que está desabando
-                                for player_idx, pos in enumerate(player_pos):
-                                    if b["rect"].collidepoint(pos[0], pos[1]):
-                                        # Gorila está no prédio que desabou - sofre dano
-                                        player_health[player_idx] -= DAMAGE_BUILDING_COLLAPSE
-                                        # Criar explosão secundária na posição do gorila
-                                        explosion = {"pos": pos, "timer": 0}
-                                
-                                # Remover o prédio do jogo
-                                buildings[i]["collapsed"] = True
-                            
-                            banana = None
-                            wind = random.randint(-10, 10)
-                            turn = 1 - turn
-                            break
-                            
-                    if banana:
-                        # Verificar colisão com o gorila adversário
-                        target_idx = 1 - banana["owner"]
-                        target = player_pos[target_idx]
-                        dist = math.hypot(x - target[0], y - target[1])
-                        if dist <= BANANA_RADIUS + MONKEY_RADIUS:
-                            # Salvar referências importantes antes de limpar a banana
-                            banana_owner = banana["owner"]
-                            explosion = {"pos": (x, y), "timer": 0}
-                            banana = None
-                            
-                            # Reduzir a energia do gorila atingido
-                            player_health[target_idx] -= DAMAGE_PER_HIT
-                            
-                            # Verificar se o gorila foi derrotado (energia <= 0)
-                            if player_health[target_idx] <= 0:
-                                # Gorila derrotado! Quem lançou ganha ponto
-                                scores[banana_owner] += 1
-                                
-                                # Salvar recordes
-                                players_scores = [
-                                    {"name": player_names[0], "score": scores[0]},
-                                    {"name": player_names[1], "score": scores[1]}
-                                ]
-                                game_storage.save_high_scores(players_scores)
-                                high_scores = game_storage.load_high_scores()
-                                
-                                # Exibir mensagem de vitória
-                                victory_screen_start = time.time()
-                                winner_text = f"{player_names[banana['owner']]} venceu!"
-                                defeat_text = f"{player_names[target_idx]} ficou sem energia!"
-                                victory_font = pygame.font.SysFont(None, 72)
-                                victory_surf = victory_font.render(winner_text, True, MONKEY_COLORS[banana['owner']])
-                                defeat_surf = victory_font.render(defeat_text, True, (255, 50, 50))
-                                screen.blit(defeat_surf, (SCREEN_WIDTH // 2 - defeat_surf.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
-                                screen.blit(victory_surf, (SCREEN_WIDTH // 2 - victory_surf.get_width() // 2, SCREEN_HEIGHT // 2 - 20))
-                                pygame.display.flip()
-                                pygame.time.delay(3000)  # Mostrar por 3 segundos
-                                
-                                # Voltar para o menu principal
-                                game_state = GAME_STATE_MENU
-                            else:
-                                # Gorila ainda tem energia, continuar o jogo
-                                wind = random.randint(-10, 10)
-                                turn = 1 - turn
-                        
-                        # Verificar colisão com o próprio gorila (autodestruição)
-                        # Só permitir após 0.5 segundos
-                        if banana["time_alive"] > 0.5:
-                            self_idx = banana["owner"]
-                            self_pos = player_pos[self_idx]
-                            self_dist = math.hypot(x - self_pos[0], y - self_pos[1])
-                            if self_dist <= BANANA_RADIUS + MONKEY_RADIUS:
-                                # Salvar referências importantes antes de limpar a banana
-                                explosion = {"pos": (x, y), "timer": 0}
-                                banana = None
-                                
-                                # Reduzir a energia do gorila que acertou a si mesmo
-                                # Fazer o dano por auto-destruição ser maior (dano x 1.5)
-                                player_health[self_idx] -= int(DAMAGE_PER_HIT * 1.5)
-                                
-                                # Verificar se o gorila foi derrotado (energia <= 0)
-                                if player_health[self_idx] <= 0:
-                                    # Gorila derrotado! Adversário ganha ponto
-                                    winner_idx = 1 - self_idx
-                                    scores[winner_idx] += 1
-                                    
-                                    # Salvar recordes
-                                    players_scores = [
-                                        {"name": player_names[0], "score": scores[0]},
-                                        {"name": player_names[1], "score": scores[1]}
-                                    ]
-                                    game_storage.save_high_scores(players_scores)
-                                    high_scores = game_storage.load_high_scores()
-                                    
-                                    # Exibir mensagem de vitória
-                                    victory_screen_start = time.time()
-                                    loser_text = f"{player_names[self_idx]} destruiu a si mesmo!"
-                                    winner_text = f"{player_names[winner_idx]} venceu!"
-                                    victory_font = pygame.font.SysFont(None, 72)
-                                    loser_surf = victory_font.render(loser_text, True, (255, 50, 50))
-                                    winner_surf = victory_font.render(winner_text, True, MONKEY_COLORS[winner_idx])
-                                    screen.blit(loser_surf, (SCREEN_WIDTH // 2 - loser_surf.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
-                                    screen.blit(winner_surf, (SCREEN_WIDTH // 2 - winner_surf.get_width() // 2, SCREEN_HEIGHT // 2))
-                                    pygame.display.flip()
-                                    pygame.time.delay(3000)  # Mostrar por 3 segundos
-                                    
-                                    # Voltar para o menu principal
-                                    game_state = GAME_STATE_MENU
-                                else:
-                                    # Gorila ainda tem energia, continuar o jogo
-                                    wind = random.randint(-10, 10)
-                                    turn = 1 - turn
-
-            # Lógica de explosão
-            if explosion:
-                explosion["timer"] += dt
-                if explosion["timer"] > EXPLOSION_DURATION:
-                    # Remover apenas a explosão, sem lógica adicional
-                    # A partida só termina quando acerta um gorila
-                    explosion = None
-
-        # Renderização baseada no estado atual do jogo
-        if game_state == GAME_STATE_MENU:
-            # Desenhar menu principal
-            draw_menu(screen, font, large_font, selected_menu_option, has_saved_game)
-            
-        elif game_state == GAME_STATE_HIGH_SCORES:
-            # Desenhar tela de recordes
-            draw_high_scores(screen, font, large_font, high_scores)
+                    renderer.mark(draw_monkey(screen, player_pos[idx], MONKEY_COLORS[idx], player_health[idx],
+                                              facing=1 if idx == 0 else -1))
+
+        if self.banana:
+            with PROFILER.stage("banana"):
+                renderer.mark(draw_banana(screen, self.banana, self.physics_stepper.alpha))
             
-        elif game_state == GAME_STATE_PLAYING and buildings and player_pos:
-            # Desenhar o jogo em andamento
-            screen.blit(background, (0, 0))
-            draw_buildings(screen, buildings)
+        if self.explosion:
+            with PROFILER.stage("explosion"):
+                renderer.mark(draw_explosion(screen, self.explosion["pos"],
+                                             self.explosion["timer"] / EXPLOSION_DURATION))
             
-            # Desenhar gorilas: sprite se disponível, ou versão primitiva
-            if gorilla_sprites[0]:
-                rect = gorilla_sprites[0].get_rect(center=player_pos[0])
-                screen.blit(gorilla_sprites[0], rect)
-                # Adicionar barra de energia acima do sprite
-                draw_health_bar(screen, player_pos[0], player_health[0], MAX_GORILLA_HEALTH)
-            else:
-                draw_monkey(screen, player_pos[0], MONKEY_COLORS[0], player_health[0])
-                
-            if gorilla_sprites[1]:
-                rect = gorilla_sprites[1].get_rect(center=player_pos[1])
-                screen.blit(gorilla_sprites[1], rect)
-                # Adicionar barra de energia acima do sprite
-                draw_health_bar(screen, player_pos[1], player_health[1], MAX_GORILLA_HEALTH)
-            else:
-                draw_monkey(screen, player_pos[1], MONKEY_COLORS[1], player_health[1])
-
-        # Renderizar elementos do jogo apenas quando estivermos jogando
-        if game_state == GAME_STATE_PLAYING:
-            if banana:
-                draw_banana(screen, banana)
-                
-            if explosion:
-                draw_explosion(screen, explosion["pos"], explosion["timer"] / EXPLOSION_DURATION)
-                
+        with PROFILER.stage("hud"):
             # Interface de jogador atual
-            turn_text = font.render(f"Turno: {player_names[turn]}", True, MONKEY_COLORS[turn])
-            screen.blit(turn_text, (10, 10))
-            
+            turn_text = TEXT_CACHE.render(font, f"Turno: {player_names[self.turn]}", MONKEY_COLORS[self.turn])
+            renderer.blit(turn_text, (10, 10))
+
             # Informações de jogo
-            text_angle = font.render(f"Ângulo: {angle}", True, (255, 255, 255))
-            text_power = font.render(f"Força: {power}", True, (255, 255, 255))
-            text_wind = font.render(f"Vento: {wind:+d}", True, (255, 255, 255))
-            text_gravity = font.render(f"Gravidade: {GRAVITY} (G/H para alterar, T para reset)", True, (255, 255, 255))
-            text_score = font.render(f"Placar: {player_names[0]} {scores[0]} - {scores[1]} {player_names[1]}", True, (255, 255, 255))
-            
+            text_angle = TEXT_CACHE.render(font, f"Ângulo: {self.angle}", (255, 255, 255))
+            text_power = TEXT_CACHE.render(font, f"Força: {self.power}", (255, 255, 255))
+            text_wind = TEXT_CACHE.render(font, f"Vento: {self.wind:+d}", (255, 255, 255))
+            text_gravity = TEXT_CACHE.render(font, f"Gravidade: {GRAVITY} (G/H para alterar, T para reset)", (255, 255, 255))
+            text_score = TEXT_CACHE.render(font, f"Placar: {player_names[0]} {self.scores[0]} - {self.scores[1]} {player_names[1]}", (255, 255, 255))
+
             # Instruções
-            instr = font.render("CIMA/BAIXO: Ângulo | ESQ/DIR: Força | R: Vento | ESC: Menu | ESPAÇO: Lançar", True, (255, 255, 255))
+            instr = TEXT_CACHE.render(font, "CIMA/BAIXO: Ângulo | ESQ/DIR: Força | R: Vento | ESC: Menu | ESPAÇO: Lançar", (255, 255, 255))
 
             # Exibir textos na tela
-            screen.blit(text_angle, (10, 40))
-            screen.blit(text_power, (10, 70))
-            screen.blit(text_wind, (10, 100))
-            screen.blit(text_gravity, (10, 130))
-            screen.blit(text_score, (SCREEN_WIDTH - 350, 10))
-            screen.blit(instr, (10, SCREEN_HEIGHT - 30))
-
-        screen.blit(apply_comic_filter(screen), (0, 0))
-        pygame.display.flip()
-
+            renderer.blit(text_angle, (10, 40))
+            renderer.blit(text_power, (10, 70))
+            renderer.blit(text_wind, (10, 100))
+            renderer.blit(text_gravity, (10, 130))
+            renderer.blit(text_score, (SCREEN_WIDTH - 350, 10))
+            renderer.blit(instr, (10, SCREEN_HEIGHT - 30))
+
+            # Indicador da CPU pensando
+            if self.ai_future is not None:
+                dots = "." * (pygame.time.get_ticks() // AI_THINKING_DOT_MS % 4)
+                thinking = TEXT_CACHE.render(font, f"{player_names[1]} pensando{dots}", AI_THINKING_COLOR)
+                renderer.blit(thinking, (SCREEN_WIDTH - 350, 40))
+
+        with PROFILER.stage("apply_comic_filter"):
+            renderer.filter()
+        # Sobreposição de tempos desenhada depois do filtro, para ficar legível
+        renderer.mark(PROFILER.draw_overlay(screen, self.ui.profiler_font, self.ui.clock.get_fps()))
+        with PROFILER.stage("flip"):
+            renderer.flip()
+
+def main(seed=None, profile_path=None):
+    # seed: semente do cenário da primeira partida (None = aleatória)
+    # profile_path: arquivo .csv ou .json para os tempos por etapa ao sair
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Gorillas 2.0")
+    
+    # Carregar fontes
+    ui = UI(screen=screen, clock=pygame.time.Clock(),
+            font=pygame.font.SysFont(None, 28), large_font=pygame.font.SysFont(None, 48),
+            profiler_font=pygame.font.SysFont("monospace", 15))
+    
+    ai_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai")
+    playing = PlayingScene(ui, ai_executor, seed)
+    scenes = {
+        GAME_STATE_MENU: MenuScene(ui),
+        GAME_STATE_NAME_INPUT: NameInputScene(ui),
+        GAME_STATE_PLAYING: playing,
+        GAME_STATE_HIGH_SCORES: HighScoresScene(ui),
+        GAME_STATE_GAME_OVER: GameOverScene(ui),
+    }
+    # Loop único para todas as telas (começa no menu)
+    SceneMachine(scenes, GAME_STATE_MENU, PROFILER).run(ui.clock)
+
+    playing.cancel_ai()
+    ai_executor.shutdown(wait=True)
+    # Terminar as gravações pendentes antes de sair (falhas vão para o stderr)
+    game_storage.flush()
+    if profile_path:
+        PROFILER.dump(profile_path)
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Semente opcional do cenário e arquivo de tempos por etapa:
+    # python3 src/main.py 12345 --profile tempos.csv
+    parser = argparse.ArgumentParser(description="Gorillas 2.0")
+    parser.add_argument("seed", type=int, nargs="?", help="semente do cenário da primeira partida")
+    parser.add_argument("--profile", metavar="ARQUIVO",
+                        help="grava p50/p95/p99 de cada etapa do quadro ao sair (.csv ou .json)")
+    args = parser.parse_args()
+    if args.seed is not None and not SEED_MIN <= args.seed <= SEED_MAX:
+        parser.error(f"a semente deve estar entre {SEED_MIN} e {SEED_MAX}")
+    main(args.seed, args.profile)
\ No newline at end of file
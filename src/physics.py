@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+import math
+
+# Passo fixo da simulação (120 Hz), independente da taxa de quadros
+PHYSICS_DT = 1.0 / 120
+# Limite de passos por quadro, para um travamento longo não congelar o jogo
+MAX_STEPS_PER_FRAME = 12
+
+def launch(origin, angle, power, turn, vel_factor, clearance):
+    """
+    Calcula posição e velocidade iniciais de um lançamento.
+
+    Args:
+        origin: Posição (x, y) do gorila que lança
+        angle: Ângulo em graus (espelhado para o segundo jogador)
+        power: Potência selecionada (0-100)
+        turn: Índice do jogador (0 ou 1)
+        vel_factor: Multiplicador de velocidade inicial
+        clearance: Distância inicial do gorila, para evitar colisão imediata
+
+    Returns:
+        (pos, vel) como listas [x, y]
+    """
+    theta = math.radians(angle if turn == 0 else 180 - angle)
+    speed = power * vel_factor
+    cos_t, sin_t = math.cos(theta), math.sin(theta)
+    # Negativo em Y porque Y aumenta para baixo
+    pos = [origin[0] + cos_t * clearance, origin[1] - sin_t * clearance]
+    vel = [cos_t * speed, -sin_t * speed]
+    return pos, vel
+
+def step(pos, vel, accel_x, accel_y, dt=PHYSICS_DT):
+    """Avança um passo de Euler semi-implícito (velocidade, depois posição), no lugar"""
+    vel[0] += accel_x * dt
+    vel[1] += accel_y * dt
+    pos[0] += vel[0] * dt
+    pos[1] += vel[1] * dt
+
+def interpolate(prev, curr, alpha):
+    """Posição intermediária entre dois passos, para renderização suave"""
+    return (prev[0] + (curr[0] - prev[0]) * alpha,
+            prev[1] + (curr[1] - prev[1]) * alpha)
+
+def trajectory(pos, vel, accel_x, accel_y, steps, dt=PHYSICS_DT):
+    """Gera as posições de `steps` passos sem tela nem relógio (replays, IA)"""
+    pos, vel = list(pos), list(vel)
+    for _ in range(steps):
+        step(pos, vel, accel_x, accel_y, dt)
+        yield pos[0], pos[1]
+
+class FixedStepper:
+    """
+    Acumulador de tempo para rodar a física em passo fixo.
+
+    Cada quadro informa o tempo real decorrido e recebe quantos passos de
+    PHYSICS_DT executar; alpha é a fração do próximo passo já acumulada,
+    usada para interpolar a posição desenhada.
+    """
+
+    def __init__(self, dt=PHYSICS_DT, max_steps=MAX_STEPS_PER_FRAME):
+        self.dt = dt
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def reset(self):
+        self.accumulator = 0.0
+
+    def advance(self, frame_dt):
+        """Acumula o tempo do quadro e retorna o número de passos a executar"""
+        self.accumulator += frame_dt
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            # Descartar o atraso excedente em vez de acumulá-lo
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self):
+        return min(self.accumulator / self.dt, 1.0)
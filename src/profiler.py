@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+import csv
+import json
+import math
+import time
+from collections import deque
+import numpy as np
+import pygame
+
+# Quadros considerados nos percentis da sobreposição (~5 s a 60 FPS)
+PROFILER_WINDOW = 300
+# Histograma da sessão inteira: baldes logarítmicos de 5% a partir de 1 µs
+HISTOGRAM_BASE = 1.05
+HISTOGRAM_MIN_NS = 1000
+# Intervalo entre atualizações do texto da sobreposição
+OVERLAY_REFRESH_MS = 500
+OVERLAY_COLOR = (255, 255, 255)
+OVERLAY_BACKGROUND = (0, 0, 0, 170)
+PERCENTILES = (50, 95, 99)
+
+# Tempo total de trabalho do quadro (de begin_frame a end_frame)
+FRAME_STAGE = "frame"
+
+class _Stage:
+    """Cronômetro reutilizável de uma etapa (with profiler.stage(nome): ...)"""
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter_ns() - self.start)
+        return False
+
+class FrameProfiler:
+    """
+    Tempo de cada etapa do quadro, medido com time.perf_counter_ns.
+
+    Uma etapa medida várias vezes no mesmo quadro (ex.: física em passo
+    fixo) é somada; etapas que não ocorreram no quadro não entram na
+    estatística. Os percentis da sobreposição usam os últimos
+    PROFILER_WINDOW quadros; dump() grava o histograma da sessão inteira.
+    Etapas aninhadas incluem o tempo das internas.
+    """
+
+    def __init__(self, window=PROFILER_WINDOW):
+        self.window = window
+        self.visible = False
+        self.frames = 0
+        self._recent = {}      # etapa -> deque com ns por quadro
+        self._histogram = {}   # etapa -> {balde: quadros}
+        self._totals = {}      # etapa -> [quadros, soma ns, máximo ns]
+        self._frame = {}       # etapa -> ns acumulados no quadro atual
+        self._stages = {}
+        self._frame_start = None
+        self._overlay = None
+        self._overlay_time = 0
+
+    def stage(self, name):
+        """Gerenciador de contexto que soma a duração do bloco à etapa"""
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages[name] = _Stage(self, name)
+        return stage
+
+    def add(self, name, ns):
+        """Soma ns nanossegundos à etapa no quadro atual"""
+        self._frame[name] = self._frame.get(name, 0) + ns
+
+    def begin_frame(self):
+        self._frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        """Fecha o quadro e registra o tempo de cada etapa medida nele"""
+        if self._frame_start is not None:
+            self._frame[FRAME_STAGE] = time.perf_counter_ns() - self._frame_start
+            self._frame_start = None
+        for name, ns in self._frame.items():
+            recent = self._recent.get(name)
+            if recent is None:
+                recent = self._recent[name] = deque(maxlen=self.window)
+                self._histogram[name] = {}
+                self._totals[name] = [0, 0, 0]
+            recent.append(ns)
+            bucket = _bucket(ns)
+            histogram = self._histogram[name]
+            histogram[bucket] = histogram.get(bucket, 0) + 1
+            totals = self._totals[name]
+            totals[0] += 1
+            totals[1] += ns
+            totals[2] = max(totals[2], ns)
+        self._frame = {}
+        self.frames += 1
+
+    def recent_percentiles(self, name):
+        """Percentis (ms) da etapa nos últimos quadros, ou None se nunca medida"""
+        recent = self._recent.get(name)
+        if not recent:
+            return None
+        return tuple(np.percentile(np.fromiter(recent, dtype=np.int64), PERCENTILES) / 1e6)
+
+    def summary(self):
+        """Estatística da sessão por etapa (ms), a partir do histograma"""
+        result = {}
+        for name, (count, total, peak) in self._totals.items():
+            stats = {"frames": count, "mean_ms": total / count / 1e6, "max_ms": peak / 1e6}
+            for p in PERCENTILES:
+                stats[f"p{p}_ms"] = _histogram_percentile(self._histogram[name], count, p) / 1e6
+            result[name] = stats
+        return result
+
+    def dump(self, path):
+        """Grava summary() em CSV (extensão .csv) ou JSON (qualquer outra)"""
+        summary = {name: {k: round(v, 4) for k, v in stats.items()}
+                   for name, stats in self.summary().items()}
+        if path.endswith(".csv"):
+            fields = ["stage", "frames", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                for name, stats in summary.items():
+                    writer.writerow({"stage": name, **stats})
+        else:
+            with open(path, "w") as f:
+                json.dump({"frames": self.frames, "stages": summary}, f, indent=2)
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._overlay = None
+
+    def draw_overlay(self, screen, font, fps=None):
+        """
+        Desenha a tabela p50/p95/p99 no canto inferior direito (se visível)
+        e retorna a área ocupada. O texto é refeito a cada OVERLAY_REFRESH_MS,
+        não a cada quadro.
+        """
+        if not self.visible:
+            return None
+        now = pygame.time.get_ticks()
+        if self._overlay is None or now - self._overlay_time >= OVERLAY_REFRESH_MS:
+            self._overlay = self._render_overlay(font, fps)
+            self._overlay_time = now
+        panel_rect = self._overlay.get_rect(bottomright=(screen.get_width() - 10, screen.get_height() - 40))
+        return screen.blit(self._overlay, panel_rect)
+
+    def _render_overlay(self, font, fps):
+        header = "etapa           p50    p95    p99 ms"
+        if fps is not None:
+            header += f"   {fps:.0f} FPS"
+        lines = [header]
+        for name in self._recent:
+            p50, p95, p99 = self.recent_percentiles(name)
+            lines.append(f"{name[:14]:<14} {p50:6.2f} {p95:6.2f} {p99:6.2f}")
+        rendered = [font.render(line, True, OVERLAY_COLOR) for line in lines]
+        line_height = font.get_linesize()
+        panel = pygame.Surface((max(r.get_width() for r in rendered) + 12,
+                                line_height * len(rendered) + 8), pygame.SRCALPHA)
+        panel.fill(OVERLAY_BACKGROUND)
+        for i, surf in enumerate(rendered):
+            panel.blit(surf, (6, 4 + i * line_height))
+        return panel
+
+def _bucket(ns):
+    return int(math.log(max(ns, HISTOGRAM_MIN_NS) / HISTOGRAM_MIN_NS, HISTOGRAM_BASE))
+
+def _histogram_percentile(histogram, count, percentile):
+    """Limite superior do balde que contém o percentil (erro de até 5%)"""
+    rank = count * percentile / 100.0
+    seen = 0
+    for bucket in sorted(histogram):
+        seen += histogram[bucket]
+        if seen >= rank:
+            return HISTOGRAM_MIN_NS * HISTOGRAM_BASE ** (bucket + 1)
+    return 0.0
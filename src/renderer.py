@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+import pygame
+
+class DirtyRenderer:
+    """
+    Renderização por retângulos sujos.
+
+    Guarda uma camada estática já composta (céu e prédios). A cada quadro
+    restaura dela só as áreas ocupadas no quadro anterior, os elementos
+    dinâmicos são desenhados e registrados com mark(), e apenas a união
+    das áreas antigas e novas vai para a tela com pygame.display.update.
+
+    O filtro opcional (ex.: ComicFilter) é aplicado uma vez à camada
+    estática e, a cada quadro, só às áreas sujas. Assim os sprites são
+    sempre misturados sobre o cenário já filtrado, e o resultado não
+    depende de quais áreas foram restauradas em quadros anteriores.
+    """
+
+    def __init__(self, screen, post_filter=None):
+        self.screen = screen
+        self.bounds = screen.get_rect()
+        self.post_filter = post_filter
+        self.static = None
+        self._previous = []  # Áreas desenhadas no quadro anterior
+        self._current = []   # Áreas desenhadas neste quadro
+        self._pending = []   # Áreas da camada estática que mudaram
+        self._full = True
+
+    def set_static(self, surface):
+        """Troca a camada estática inteira (filtrada no lugar; força um quadro completo)"""
+        if self.post_filter:
+            self.post_filter.apply(surface)
+        self.static = surface
+        self.invalidate()
+
+    def update_static(self, rect):
+        """
+        Avisa que uma área da camada estática foi redesenhada no lugar:
+        filtra só essa área e a marca para o próximo quadro.
+        """
+        rect = self.bounds.clip(rect)
+        if self.post_filter:
+            self.post_filter.apply_rects(self.static, [rect])
+        self.invalidate(rect)
+
+    def invalidate(self, rect=None):
+        """Marca uma área (ou a tela toda, com rect=None) para ser redesenhada"""
+        if rect is None:
+            self._full = True
+            return
+        rect = self.bounds.clip(rect)
+        if rect.width and rect.height:
+            self._pending.append(rect)
+
+    def begin_frame(self):
+        """Apaga os elementos do quadro anterior restaurando a camada estática"""
+        if self._full:
+            self.screen.blit(self.static, (0, 0))
+            return
+        for rect in self._previous + self._pending:
+            self.screen.blit(self.static, rect, rect)
+
+    def mark(self, rect):
+        """Registra a área de algo desenhado diretamente na tela neste quadro"""
+        if rect is None:
+            return rect
+        clipped = self.bounds.clip(rect)
+        if clipped.width and clipped.height:
+            self._current.append(clipped)
+        return rect
+
+    def blit(self, surface, dest, area=None):
+        """Blit na tela já registrando a área ocupada"""
+        return self.mark(self.screen.blit(surface, dest, area))
+
+    def present(self):
+        """Filtra as áreas sujas e envia à tela só o que mudou"""
+        self.filter()
+        self.flip()
+
+    def filter(self):
+        """Aplica o filtro às áreas sujas do quadro (primeira metade de present)"""
+        if not self.post_filter:
+            return
+        if self._full:
+            self.post_filter.apply(self.screen)
+        else:
+            self.post_filter.apply_rects(self.screen, self._previous + self._pending + self._current)
+
+    def flip(self):
+        """
+        Envia o quadro à tela (segunda metade de present). Áreas marcadas
+        entre filter() e flip() vão para a tela sem filtro.
+        """
+        if self._full:
+            pygame.display.flip()
+            self._full = False
+        else:
+            pygame.display.update(self._previous + self._pending + self._current)
+        self._previous = self._current
+        self._current = []
+        self._pending = []
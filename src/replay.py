@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# Gravação e reprodução de partidas. Cada lançamento é determinado por
+# (cenário, ângulo, força, vento, gravidade, vez), então o arquivo guarda só
+# a semente do cenário e as entradas de cada lançamento; a partida é
+# recalculada com a simulação sem tela na hora de assistir.
+import os
+import struct
+from collections import namedtuple
+
+import game_storage
+import simulation
+
+# Arquivo único, só com acréscimos no fim (registros de várias partidas)
+REPLAY_FILE = os.path.join(game_storage.DATA_DIR, "replays.bin")
+
+# Formato: cabeçalho do arquivo e registros em little-endian, cada um
+# começando pela etiqueta e pelo identificador da partida
+_MAGIC = b"GRPL"
+_VERSION = 1
+_FILE_HEADER = struct.Struct("<4sI")      # magic, versão
+_MATCH = struct.Struct("<cIqHHB")         # "M", partida, semente, largura, altura, versão do gerador
+_NAME = struct.Struct("<B")               # tamanho do nome em UTF-8 (seguido dos bytes)
+_SHOT = struct.Struct("<cIBBBbI")         # "S", partida, vez, ângulo, força, vento, gravidade
+_END = struct.Struct("<cIB")              # "E", partida, vencedor
+
+# Partida lida do arquivo. winner é None se a partida não terminou
+Match = namedtuple("Match", ["id", "seed", "size", "generator_version", "names", "shots", "winner"])
+Shot = namedtuple("Shot", ["turn", "angle", "power", "wind", "gravity"])
+
+# Regras de dano e energia da partida (os valores do jogo ficam em main.REPLAY_RULES)
+MatchRules = namedtuple("MatchRules", ["max_health", "hit_damage", "self_hit_damage", "collapse_damage"])
+
+# Um lançamento recalculado: resultado da simulação, se o prédio atingido
+# desabou, energia dos gorilas depois do lançamento e vencedor (ou None)
+ReplayStep = namedtuple("ReplayStep", ["shot", "result", "collapsed", "health", "winner"])
+
+def _new_match_id():
+    return int.from_bytes(os.urandom(4), "little")
+
+def _encode_name(name):
+    data = name.encode("utf-8")[:255]
+    return _NAME.pack(len(data)) + data
+
+class ReplayRecorder:
+    """
+    Grava as entradas da partida em andamento no arquivo de replays.
+
+    Uma partida interrompida (salva e continuada depois) segue com o mesmo
+    identificador, então o replay cobre a partida inteira.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or REPLAY_FILE
+        self.match_id = None
+
+    def start_match(self, seed, size, generator_version, names):
+        """Começa a gravar uma nova partida e retorna seu identificador"""
+        self.match_id = _new_match_id()
+        self._append(_MATCH.pack(b"M", self.match_id, seed, size[0], size[1], generator_version)
+                     + b"".join(_encode_name(name) for name in names))
+        return self.match_id
+
+    def resume_match(self, match_id):
+        """Continua a gravar uma partida salva (None: partida sem replay)"""
+        self.match_id = match_id
+
+    def record_shot(self, turn, angle, power, wind, gravity):
+        if self.match_id is not None:
+            self._append(_SHOT.pack(b"S", self.match_id, turn, angle, power, wind, gravity))
+
+    def end_match(self, winner):
+        if self.match_id is not None:
+            self._append(_END.pack(b"E", self.match_id, winner))
+            self.match_id = None
+
+    def _append(self, record):
+        # Na thread de gravação do jogo, fora do quadro do lançamento; uma
+        # falha é informada por game_storage.flush() e o jogo continua
+        game_storage.append_async(self.path, record, _FILE_HEADER.pack(_MAGIC, _VERSION))
+
+def read_replays(path=None):
+    """
+    Lê todas as partidas gravadas, na ordem em que começaram.
+
+    Um registro incompleto no fim do arquivo (jogo fechado no meio de uma
+    gravação) é ignorado.
+    """
+    try:
+        with open(path or REPLAY_FILE, "rb") as f:
+            data = f.read()
+    except OSError:
+        return []
+    if len(data) < _FILE_HEADER.size or _FILE_HEADER.unpack_from(data) != (_MAGIC, _VERSION):
+        return []
+
+    matches = {}
+    offset = _FILE_HEADER.size
+    try:
+        while offset < len(data):
+            tag = data[offset:offset + 1]
+            if tag == b"M":
+                _, match_id, seed, width, height, version = _MATCH.unpack_from(data, offset)
+                offset += _MATCH.size
+                names = []
+                for _ in range(2):
+                    (length,) = _NAME.unpack_from(data, offset)
+                    offset += _NAME.size
+                    if offset + length > len(data):
+                        raise struct.error("nome incompleto")
+                    names.append(data[offset:offset + length].decode("utf-8", "replace"))
+                    offset += length
+                matches[match_id] = Match(match_id, seed, (width, height), version, names, [], None)
+            elif tag == b"S":
+                _, match_id, turn, angle, power, wind, gravity = _SHOT.unpack_from(data, offset)
+                offset += _SHOT.size
+                if match_id in matches:
+                    matches[match_id].shots.append(Shot(turn, angle, power, wind, gravity))
+            elif tag == b"E":
+                _, match_id, winner = _END.unpack_from(data, offset)
+                offset += _END.size
+                if match_id in matches:
+                    matches[match_id] = matches[match_id]._replace(winner=winner)
+            else:
+                break  # Arquivo corrompido: manter o que foi lido até aqui
+    except struct.error:
+        pass
+    return list(matches.values())
+
+def resimulate(match, world, rules, match_rules):
+    """
+    Recalcula a partida lançamento por lançamento (gerador de ReplayStep).
+
+    world é o mundo da simulação (simulation.make_world) no cenário da
+    semente da partida e é alterado pelas crateras. Dano, desabamentos e
+    fim de partida seguem a mesma lógica do loop do jogo.
+    """
+    health = [match_rules.max_health, match_rules.max_health]
+    for shot in match.shots:
+        result = simulation.simulate_shot(world, shot.angle, shot.power, shot.wind,
+                                          shot.gravity, shot.turn, rules)
+        collapsed = False
+        winner = None
+        if result.kind == "building":
+            collapsed = simulation.apply_impact(world, result, rules)
+            if collapsed:
+                # Gorilas sobre o prédio que desabou também sofrem dano
+                rect = world["buildings"][result.building]["rect"]
+                for player_idx, pos in enumerate(world["player_pos"]):
+                    if rect.collidepoint(pos[0], pos[1]):
+                        health[player_idx] -= match_rules.collapse_damage
+        elif result.kind == "gorilla":
+            target = result.player
+            if target == shot.turn:
+                health[target] -= match_rules.self_hit_damage
+                winner_idx = 1 - target
+            else:
+                health[target] -= match_rules.hit_damage
+                winner_idx = shot.turn
+            if health[target] <= 0:
+                winner = winner_idx
+        yield ReplayStep(shot, result, collapsed, tuple(health), winner)
+        if winner is not None:
+            return
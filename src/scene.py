@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+import time
+import pygame
+
+# Tecla que liga e desliga a sobreposição do medidor de quadros
+PROFILER_KEY = pygame.K_F3
+
+class Scene:
+    """
+    Um estado do jogo (menu, entrada de nomes, partida, recordes, fim de
+    partida) com seus próprios handle_event, update e render.
+
+    Cenas ociosas (idle = True) só são redesenhadas quando marcam
+    self.dirty, e o loop roda nelas a uma taxa menor (fps), então uma tela
+    parada quase não usa CPU.
+    """
+
+    idle = False
+    fps = 60
+
+    def __init__(self):
+        self.machine = None
+        self.dirty = True
+
+    def enter(self, **kwargs):
+        """Chamado ao entrar na cena; os argumentos vêm de SceneMachine.switch"""
+        self.dirty = True
+
+    def exit(self):
+        """Chamado ao sair da cena"""
+
+    def handle_event(self, event):
+        pass
+
+    def update(self, dt):
+        pass
+
+    def render(self):
+        pass
+
+    def quit(self):
+        """Chamado quando a janela é fechada com esta cena ativa"""
+
+    def switch(self, key, **kwargs):
+        """Troca para outra cena da mesma máquina"""
+        self.machine.switch(key, **kwargs)
+
+class SceneMachine:
+    """
+    Loop único, com ritmo de quadros, compartilhado por todas as cenas.
+
+    A cada quadro: eventos para a cena ativa (que pode trocar de cena no
+    meio do lote; os eventos seguintes já vão para a nova), update(dt) e
+    render() quando a cena não é ociosa ou mudou.
+    """
+
+    def __init__(self, scenes, initial, profiler):
+        self.scenes = scenes
+        self.profiler = profiler
+        self.current = None
+        self.running = False
+        for scene in scenes.values():
+            scene.machine = self
+        self.switch(initial)
+
+    def switch(self, key, **kwargs):
+        if self.current is not None:
+            self.current.exit()
+        self.current = self.scenes[key]
+        self.current.enter(**kwargs)
+
+    def stop(self):
+        self.running = False
+
+    def run(self, clock):
+        profiler = self.profiler
+        self.running = True
+        while self.running:
+            dt = clock.tick(self.current.fps) / 1000.0
+            profiler.begin_frame()
+
+            events_start = time.perf_counter_ns()
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.current.quit()
+                    self.stop()
+                    break
+                if event.type == pygame.KEYDOWN and event.key == PROFILER_KEY:
+                    profiler.toggle()
+                    # Cenas ociosas redesenham para mostrar ou apagar a sobreposição
+                    self.current.dirty = True
+                self.current.handle_event(event)
+            profiler.add("events", time.perf_counter_ns() - events_start)
+            if not self.running:
+                break
+
+            scene = self.current
+            scene.update(dt)
+            # O medidor visível muda a cada meio segundo: redesenhar sempre
+            if self.current is scene and (not scene.idle or scene.dirty or profiler.visible):
+                scene.render()
+                scene.dirty = False
+            profiler.end_frame()
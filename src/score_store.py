@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+import os
+import json
+import sqlite3
+import datetime
+
+# Quantidade de recordes mostrada no menu
+TOP_SCORES = 10
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scores_score ON scores (score DESC, id);
+CREATE INDEX IF NOT EXISTS idx_scores_player ON scores (player, score DESC);
+CREATE INDEX IF NOT EXISTS idx_scores_timestamp ON scores (timestamp);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+def _row_to_score(row):
+    """Linha do banco no formato de recorde usado pelas telas"""
+    player, score, timestamp = row
+    return {"name": player, "score": score, "timestamp": timestamp}
+
+class ScoreStore:
+    """
+    Histórico de pontuações em SQLite.
+
+    Cada partida só acrescenta linhas (nada é apagado), e as consultas de
+    melhores pontuações e por jogador usam índices. Os recordes do menu
+    ficam em memória e só são recalculados quando há uma nova inserção.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        # WAL: inserções não bloqueiam leituras e o commit é barato
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self._top = None
+
+    def close(self):
+        self.conn.close()
+
+    def add_scores(self, players_scores, timestamp=None):
+        """
+        Acrescenta as pontuações de uma partida.
+
+        Args:
+            players_scores: [{'name': 'Player1', 'score': 5}, ...]
+            timestamp: Data da partida (padrão: agora)
+        """
+        if timestamp is None:
+            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO scores (player, score, timestamp) VALUES (?, ?, ?)",
+                [(p["name"], int(p["score"]), timestamp) for p in players_scores])
+        self._top = None
+
+    def top(self, limit=TOP_SCORES):
+        """Melhores pontuações (maior primeiro; empates pela mais antiga)"""
+        if limit == TOP_SCORES and self._top is not None:
+            return list(self._top)
+        rows = self.conn.execute(
+            "SELECT player, score, timestamp FROM scores ORDER BY score DESC, id LIMIT ?", (limit,))
+        scores = [_row_to_score(row) for row in rows]
+        if limit == TOP_SCORES:
+            self._top = scores
+        return list(scores)
+
+    def player_scores(self, player, limit=TOP_SCORES):
+        """Melhores pontuações de um jogador"""
+        rows = self.conn.execute(
+            "SELECT player, score, timestamp FROM scores WHERE player = ? ORDER BY score DESC LIMIT ?",
+            (player, limit))
+        return [_row_to_score(row) for row in rows]
+
+    def player_stats(self, player):
+        """Partidas, melhor pontuação, total e última partida de um jogador"""
+        games, best, total, last = self.conn.execute(
+            "SELECT COUNT(*), MAX(score), COALESCE(SUM(score), 0), MAX(timestamp) FROM scores WHERE player = ?",
+            (player,)).fetchone()
+        return {"name": player, "games": games, "best": best, "total": total, "last": last}
+
+    def migrate_json(self, json_path):
+        """
+        Importa uma única vez os recordes do antigo scores.json.
+
+        Returns:
+            Quantidade de pontuações importadas
+        """
+        done = self.conn.execute("SELECT value FROM meta WHERE key = 'migrated_json'").fetchone()
+        if done or not os.path.exists(json_path):
+            return 0
+        try:
+            with open(json_path, "r") as f:
+                old_scores = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            old_scores = []
+        if not isinstance(old_scores, list):
+            old_scores = []
+        rows = []
+        for s in old_scores:
+            if not isinstance(s, dict) or "name" not in s or "score" not in s:
+                continue
+            try:
+                score = int(s["score"])
+            except (TypeError, ValueError):
+                continue  # Entrada corrompida: importar as demais
+            rows.append((str(s["name"]), score, str(s.get("timestamp", "N/A"))))
+        with self.conn:
+            self.conn.executemany("INSERT INTO scores (player, score, timestamp) VALUES (?, ?, ?)", rows)
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_json', ?)", (json_path,))
+        self._top = None
+        return len(rows)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# Núcleo da simulação sem tela: física, colisões e dano aos prédios.
+# Não abre janela nem depende de relógio, então pode avaliar milhares de
+# lançamentos por chamada (IA, análises de balanceamento, replays, CI).
+import functools
+from collections import namedtuple
+import numpy as np
+
+import physics
+import collision
+from skyline import Skyline
+
+# Regras e constantes físicas usadas pela simulação (os valores do jogo
+# ficam em main.SIM_RULES)
+Rules = namedtuple("Rules", [
+    "width", "height",           # Limites do mundo (a banana sai pela esquerda, direita ou base)
+    "wind_factor",               # Influência do vento em pixels/segundo²
+    "vel_factor",                # Multiplicador da velocidade inicial
+    "banana_radius",
+    "monkey_radius",
+    "explosion_radius",
+    "self_hit_delay",            # Segundos até a banana poder atingir o próprio dono
+    "max_time",                  # Tempo máximo de voo simulado, em segundos
+])
+
+# Resultado de um lançamento. kind: "building", "gorilla", "out" ou "timeout"
+# building/player indicam o prédio ou jogador atingido (ou None)
+ShotResult = namedtuple("ShotResult", ["kind", "x", "y", "time", "steps", "building", "player"])
+
+# Fração mínima da base intacta para o prédio continuar de pé
+COLLAPSE_THRESHOLD = 0.3
+
+@functools.lru_cache(maxsize=64)
+def _crater_rings(radius):
+    """
+    Partes da cratera de um raio que não dependem do deslocamento do centro.
+
+    O deslocamento do centro em relação ao pixel de origem fica em (-1, 1)
+    em cada eixo (int() trunca para zero, e centros fora do prédio podem
+    ser negativos). Para qualquer deslocamento, alguns pixels estão sempre dentro do círculo e outros sempre fora; só
+    o anel entre eles precisa ser testado a cada impacto.
+
+    Returns:
+        (offsets, inside, ring_x, ring_y): deslocamentos inteiros da caixa,
+        máscara dos pixels sempre dentro e índices do anel
+    """
+    radius_int = int(radius)
+    offsets = np.arange(-radius_int, radius_int + 1, dtype=np.float64)
+    # Menor e maior |offset - frac| para frac em (-1, 1)
+    near = np.maximum(np.abs(offsets) - 1, 0)
+    far = np.abs(offsets) + 1
+    # Margem para arredondamento: na dúvida, o pixel vai para o anel
+    inside = np.hypot(far[:, None], far[None, :]) <= radius - 1e-9
+    outside = np.hypot(near[:, None], near[None, :]) > radius + 1e-9
+    ring_x, ring_y = np.nonzero(~(inside | outside))
+    for array in (offsets, inside, ring_x, ring_y):
+        array.flags.writeable = False
+    return offsets, inside, ring_x, ring_y
+
+def crater_mask(radius, frac_x=0.0, frac_y=0.0):
+    """
+    Máscara circular (indexada [x, y], como o surfarray) de uma cratera.
+
+    frac_x/frac_y são o deslocamento do centro real em relação ao pixel
+    inteiro usado como origem da caixa, para que o corte seja idêntico ao
+    teste math.hypot(px - x, py - y) <= radius feito pixel a pixel. O
+    miolo e o anel de borda de cada raio ficam em cache; só o anel é
+    recalculado para o deslocamento do impacto.
+    """
+    offsets, inside, ring_x, ring_y = _crater_rings(radius)
+    mask = inside.copy()
+    mask[ring_x, ring_y] = np.hypot(offsets[ring_x] - frac_x, offsets[ring_y] - frac_y) <= radius
+    return mask
+
+def crater_box(size, center, radius):
+    """
+    Recorta a máscara da cratera aos limites (largura, altura) de um prédio.
+
+    Returns:
+        (x0, y0, x1, y1, mask) nas coordenadas do prédio, ou None se o
+        círculo não toca o prédio
+    """
+    x, y = center
+    x_int, y_int = int(x), int(y)
+    radius_int = int(radius)
+    x0, y0 = max(0, x_int - radius_int), max(0, y_int - radius_int)
+    x1 = min(size[0], x_int + radius_int + 1)
+    y1 = min(size[1], y_int + radius_int + 1)
+    if x0 >= x1 or y0 >= y1:
+        return None
+    mask = crater_mask(radius, x - x_int, y - y_int)
+    mask = mask[x0 - (x_int - radius_int):x1 - (x_int - radius_int),
+                y0 - (y_int - radius_int):y1 - (y_int - radius_int)]
+    return x0, y0, x1, y1, mask
+
+def make_world(buildings, player_pos, rules, copy=False):
+    """
+    Monta o mundo da simulação a partir dos prédios do jogo.
+
+    Só "rect" e "solid" de cada prédio são usados. Com copy=True as
+    máscaras são copiadas, para que apply_impact não altere o jogo.
+    """
+    sim_buildings = []
+    for b in buildings:
+        solid = b.get("solid")
+        if copy and solid is not None:
+            solid = solid.copy()
+        sim_buildings.append({"rect": b["rect"], "solid": solid,
+                              "collapsed": b.get("collapsed", False)})
+    return {
+        "buildings": sim_buildings,
+        "player_pos": [tuple(p) for p in player_pos],
+        "skyline": Skyline(sim_buildings, rules.width, rules.height),
+        # Incrementado a cada alteração, para caches de resultados
+        "version": 0,
+    }
+
+def simulate_shot(world, angle, power, wind, gravity, shooter, rules, dt=physics.PHYSICS_DT):
+    """
+    Simula um lançamento completo sem alterar o mundo.
+
+    Usa o mesmo passo fixo, a mesma ordem de operações e a mesma colisão
+    contínua do jogo, então o resultado é idêntico ao de uma partida.
+    """
+    player_pos = world["player_pos"]
+    pos, vel = physics.launch(player_pos[shooter], angle, power, shooter,
+                              rules.vel_factor, rules.monkey_radius + rules.banana_radius + 5)
+    prev = list(pos)
+    accel_x = wind * rules.wind_factor
+    radius = rules.banana_radius + rules.monkey_radius
+    target = [(1 - shooter, player_pos[1 - shooter])]
+    both = target + [(shooter, player_pos[shooter])]
+    buildings, skyline = world["buildings"], world["skyline"]
+    time_alive = 0
+    max_steps = int(rules.max_time / dt)
+
+    for steps in range(1, max_steps + 1):
+        time_alive += dt
+        prev[0], prev[1] = pos
+        physics.step(pos, vel, accel_x, gravity, dt)
+        targets = both if time_alive > rules.self_hit_delay else target
+        hit = collision.sweep(prev, pos, buildings, targets, radius, skyline)
+        if hit is not None:
+            if hit.kind == "building":
+                return ShotResult("building", hit.x, hit.y, time_alive, steps, hit.index, None)
+            return ShotResult("gorilla", hit.x, hit.y, time_alive, steps, None, hit.index)
+        x, y = pos
+        if x < 0 or x > rules.width or y > rules.height:
+            return ShotResult("out", x, y, time_alive, steps, None, None)
+    return ShotResult("timeout", pos[0], pos[1], time_alive, max_steps, None, None)
+
+def simulate_batch(world, shots, wind, gravity, shooter, rules):
+    """Avalia vários lançamentos (pares (ângulo, potência)) no mesmo mundo"""
+    return [simulate_shot(world, angle, power, wind, gravity, shooter, rules)
+            for angle, power in shots]
+
+def apply_impact(world, result, rules):
+    """
+    Abre a cratera de um resultado "building" no mundo da simulação.
+
+    Returns:
+        True se o prédio atingido perdeu a sustentação (desabou)
+    """
+    if result.kind != "building":
+        return False
+    b = world["buildings"][result.building]
+    rect, solid = b["rect"], b["solid"]
+    if solid is None:
+        return False
+    box = crater_box(solid.shape, (result.x - rect.x, result.y - rect.y), rules.explosion_radius)
+    if box:
+        x0, y0, x1, y1, mask = box
+        solid[x0:x1, y0:y1] &= ~mask
+        world["skyline"].refresh(result.building)
+    world["version"] += 1
+
+    # Verificar os 30 pixels inferiores ou 20% da altura
+    base_check_height = min(30, rect.height // 5)
+    base = solid[:, rect.height - base_check_height:]
+    collapsed = np.count_nonzero(base) / base.size < COLLAPSE_THRESHOLD
+    if collapsed:
+        b["collapsed"] = True
+    return collapsed
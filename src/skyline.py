@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import bisect
+import math
+import numpy as np
+
+class Skyline:
+    """
+    Índice espacial do horizonte de prédios.
+
+    Os prédios são gerados da esquerda para a direita, então as bordas
+    esquerdas já estão ordenadas: uma busca binária encontra o prédio sob
+    um x. Também mantém, por coluna da tela, o y do pixel sólido mais alto,
+    atualizado quando uma cratera é aberta, para descartar rapidamente
+    segmentos que passam acima de todos os prédios.
+    """
+
+    def __init__(self, buildings, width, height):
+        self.buildings = buildings
+        self.width = width
+        self.height = height
+        self.lefts = [b["rect"].x for b in buildings]
+        self.rights = [b["rect"].right for b in buildings]
+        # Colunas sem nada sólido ficam com a altura da tela (abaixo de tudo)
+        self.tops = np.full(width, height, dtype=np.int32)
+        for i in range(len(buildings)):
+            self.refresh(i)
+
+    def refresh(self, index):
+        """Recalcula o topo das colunas cobertas por um prédio (após dano)"""
+        b = self.buildings[index]
+        rect = b["rect"]
+        x0, x1 = max(0, rect.x), min(self.width, rect.right)
+        if x0 >= x1:
+            return
+        solid = b.get("solid")
+        if solid is None:
+            # Sem máscara de pixels, o retângulo inteiro é sólido
+            self.tops[x0:x1] = rect.y
+            return
+        cols = solid[x0 - rect.x:x1 - rect.x]
+        has_pixels = cols.any(axis=1)
+        self.tops[x0:x1] = np.where(has_pixels, rect.y + cols.argmax(axis=1), self.height)
+
+    def index_at(self, x):
+        """Índice do prédio que cobre a coordenada x, ou None"""
+        i = bisect.bisect_right(self.lefts, x) - 1
+        if i >= 0 and x < self.rights[i]:
+            return i
+        return None
+
+    def candidates(self, x0, x1):
+        """Intervalo de índices dos prédios que cruzam o intervalo [x0, x1]"""
+        if x0 > x1:
+            x0, x1 = x1, x0
+        first = max(0, bisect.bisect_right(self.lefts, x0) - 1)
+        last = bisect.bisect_right(self.lefts, x1)
+        return range(first, last)
+
+    def min_top(self, x0, x1):
+        """Menor y sólido (ponto mais alto) entre as colunas x0 e x1"""
+        if x0 > x1:
+            x0, x1 = x1, x0
+        c0 = max(0, math.floor(x0))
+        c1 = min(self.width, math.floor(x1) + 1)
+        if c0 >= c1:
+            return self.height
+        return int(self.tops[c0:c1].min())
+
+    def segment_above(self, p0, p1):
+        """True se o segmento passa inteiramente acima do horizonte"""
+        return max(p0[1], p1[1]) < self.min_top(p0[0], p1[0])
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# Resolvedor vetorizado: avança uma grade inteira de lançamentos (ângulo x
+# potência) em paralelo com NumPy, usando a mesma física de passo fixo do
+# jogo. Cada banana é desativada assim que colide ou sai da tela.
+import math
+from collections import namedtuple
+import numpy as np
+
+import physics
+from collision import MASK_SAMPLE_SPACING
+
+# Códigos de resultado por lançamento
+HIT_NONE = 0      # Ainda voando ao fim do tempo máximo
+HIT_OUT = 1       # Saiu da tela
+HIT_BUILDING = 2  # Atingiu um prédio
+HIT_TARGET = 3    # Atingiu o gorila adversário
+HIT_SELF = 4      # Atingiu o próprio gorila
+
+# Resultado de hit_map: matrizes com forma (len(angles), len(powers))
+HitMap = namedtuple("HitMap", ["angles", "powers", "kind", "x", "y", "time", "building"])
+
+def world_bitmap(world, rules):
+    """
+    Máscara booleana [x, y] do mundo inteiro (pixels sólidos dos prédios)
+    e o índice do prédio de cada coluna, guardados no mundo até ele mudar.
+    """
+    cached = world.get("_bitmap")
+    if cached and cached[0] == world["version"]:
+        return cached[1], cached[2]
+    bitmap = np.zeros((rules.width, rules.height), dtype=bool)
+    owner = np.full(rules.width, -1, dtype=np.int32)
+    for i, b in enumerate(world["buildings"]):
+        rect = b["rect"]
+        x0, x1 = max(0, rect.x), min(rules.width, rect.right)
+        y0, y1 = max(0, rect.y), min(rules.height, rect.bottom)
+        if x0 >= x1 or y0 >= y1:
+            continue
+        owner[x0:x1] = i
+        if b.get("solid") is None:
+            bitmap[x0:x1, y0:y1] = True
+        else:
+            bitmap[x0:x1, y0:y1] |= b["solid"][x0 - rect.x:x1 - rect.x, y0 - rect.y:y1 - rect.y]
+    world["_bitmap"] = (world["version"], bitmap, owner)
+    return bitmap, owner
+
+def _circle_toi(px, py, dx, dy, center, radius):
+    """Primeiro t em [0, 1] de cada segmento dentro do círculo (inf se não entra)"""
+    fx, fy = px - center[0], py - center[1]
+    a = dx * dx + dy * dy
+    b = 2 * (fx * dx + fy * dy)
+    c = fx * fx + fy * fy - radius * radius
+    disc = b * b - 4 * a * c
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = (-b - np.sqrt(disc)) / (2 * a)
+    t = np.where((disc >= 0) & (a > 0) & (t >= 0) & (t <= 1), t, np.inf)
+    return np.where(c <= 0, 0.0, t)
+
+def hit_map(world, wind, gravity, shooter, angles, powers, rules, dt=physics.PHYSICS_DT):
+    """
+    Simula todos os pares (ângulo, potência) de uma vez.
+
+    Os prédios são testados por amostragem do segmento de cada passo a cada
+    MASK_SAMPLE_SPACING pixels na máscara do mundo; os gorilas, por
+    interseção exata segmento-círculo. O resultado aproxima o de
+    simulation.simulate_shot, que amostra só o trecho recortado por cada
+    prédio: um segmento que apenas raspa o canto de um prédio pode dar
+    resultados diferentes (tests/test_solver.py limita a diferença).
+    """
+    for result in iter_hit_map(world, wind, gravity, shooter, angles, powers, rules, dt):
+        if result is not None:
+            return result
+
+def iter_hit_map(world, wind, gravity, shooter, angles, powers, rules,
+                 dt=physics.PHYSICS_DT, steps_per_yield=None):
+    """
+    Versão em gerador de hit_map: produz None a cada steps_per_yield passos
+    (para intercalar com os quadros do jogo) e, por fim, o HitMap.
+    """
+    angles = np.asarray(angles, dtype=np.float64)
+    powers = np.asarray(powers, dtype=np.float64)
+    shape = (len(angles), len(powers))
+    bitmap, owner = world_bitmap(world, rules)
+    width, height = bitmap.shape
+
+    # Condições iniciais (mesma conta de physics.launch, em lote)
+    theta = np.radians(angles if shooter == 0 else 180 - angles)
+    cos_t = np.repeat(np.cos(theta), len(powers))
+    sin_t = np.repeat(np.sin(theta), len(powers))
+    speed = np.tile(powers * rules.vel_factor, len(angles))
+    origin = world["player_pos"][shooter]
+    clearance = rules.monkey_radius + rules.banana_radius + 5
+    px = origin[0] + cos_t * clearance
+    py = origin[1] - sin_t * clearance
+    vx = cos_t * speed
+    vy = -sin_t * speed
+
+    count = px.size
+    kind = np.full(count, HIT_NONE, dtype=np.int8)
+    hit_x, hit_y = px.copy(), py.copy()
+    hit_t = np.zeros(count)
+    hit_b = np.full(count, -1, dtype=np.int32)
+    active = np.arange(count)
+    accel_x = wind * rules.wind_factor
+    radius = rules.banana_radius + rules.monkey_radius
+    target_pos = world["player_pos"][1 - shooter]
+    self_pos = world["player_pos"][shooter]
+    time_alive = 0
+
+    for step in range(1, int(rules.max_time / dt) + 1):
+        if active.size == 0:
+            break
+        if steps_per_yield and step % steps_per_yield == 0:
+            yield None
+        time_alive += dt
+        # Euler semi-implícito, na mesma ordem de physics.step
+        vx[active] += accel_x * dt
+        vy[active] += gravity * dt
+        x0, y0 = px[active], py[active]
+        x1 = x0 + vx[active] * dt
+        y1 = y0 + vy[active] * dt
+        px[active], py[active] = x1, y1
+        dx, dy = x1 - x0, y1 - y0
+
+        # Prédios: amostras ao longo do segmento na máscara do mundo
+        samples = int(math.sqrt(float((dx * dx + dy * dy).max())) / MASK_SAMPLE_SPACING) + 2
+        ts = np.linspace(0.0, 1.0, samples)
+        sx = np.floor(x0[:, None] + dx[:, None] * ts).astype(np.intp)
+        sy = np.floor(y0[:, None] + dy[:, None] * ts).astype(np.intp)
+        inside = (sx >= 0) & (sx < width) & (sy >= 0) & (sy < height)
+        solid = np.zeros(sx.shape, dtype=bool)
+        solid[inside] = bitmap[sx[inside], sy[inside]]
+        any_solid = solid.any(axis=1)
+        t_building = np.where(any_solid, ts[solid.argmax(axis=1)], np.inf)
+
+        # Gorilas: adversário sempre; o próprio só após o atraso
+        t_target = _circle_toi(x0, y0, dx, dy, target_pos, radius)
+        if time_alive > rules.self_hit_delay:
+            t_self = _circle_toi(x0, y0, dx, dy, self_pos, radius)
+        else:
+            t_self = np.full(active.size, np.inf)
+
+        t_hit = np.minimum(t_building, np.minimum(t_target, t_self))
+        hit = np.isfinite(t_hit)
+        out = ~hit & ((x1 < 0) | (x1 > rules.width) | (y1 > rules.height))
+
+        if hit.any():
+            idx = active[hit]
+            th = t_hit[hit]
+            hx = x0[hit] + dx[hit] * th
+            hy = y0[hit] + dy[hit] * th
+            codes = np.where(t_building[hit] <= np.minimum(t_target[hit], t_self[hit]), HIT_BUILDING,
+                             np.where(t_target[hit] <= t_self[hit], HIT_TARGET, HIT_SELF))
+            kind[idx] = codes
+            hit_x[idx], hit_y[idx] = hx, hy
+            hit_t[idx] = time_alive
+            columns = np.clip(np.floor(hx).astype(np.intp), 0, width - 1)
+            hit_b[idx] = np.where(codes == HIT_BUILDING, owner[columns], -1)
+        if out.any():
+            idx = active[out]
+            kind[idx] = HIT_OUT
+            hit_x[idx], hit_y[idx] = x1[out], y1[out]
+            hit_t[idx] = time_alive
+        active = active[~(hit | out)]
+
+    hit_t[active] = time_alive
+    hit_x[active], hit_y[active] = px[active], py[active]
+    yield HitMap(angles, powers, kind.reshape(shape), hit_x.reshape(shape),
+                  hit_y.reshape(shape), hit_t.reshape(shape), hit_b.reshape(shape))
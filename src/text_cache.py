@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+from collections import OrderedDict
+
+# Quantidade de textos renderizados mantidos em cache
+TEXT_CACHE_SIZE = 128
+
+class TextCache:
+    """
+    Cache LRU de textos renderizados.
+
+    font.render rasteriza o texto a cada chamada, mas a interface mostra
+    quase sempre as mesmas linhas (rótulos, instruções, valores que só
+    mudam ao apertar uma tecla). As superfícies ficam guardadas por
+    (fonte, texto, cor, antialias) e são compartilhadas: quem as recebe
+    só deve fazer blit, nunca desenhar nelas.
+
+    hits e misses contam acertos e renderizações, para conferir a eficácia.
+    """
+
+    def __init__(self, maxsize=TEXT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def render(self, font, text, color, antialias=True):
+        """Equivalente a font.render(text, antialias, color), com cache"""
+        key = (font, text, tuple(color), antialias)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.maxsize:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def __len__(self):
+        return len(self._surfaces)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+import os
+import struct
+import zlib
+import pygame
+
+import game_storage
+
+# Cenários gerados ficam em data/worlds, um arquivo por (semente, resolução, versão)
+WORLD_CACHE_DIR = os.path.join(game_storage.DATA_DIR, "worlds")
+# Arquivos mantidos no cache (os acessados há mais tempo são removidos)
+WORLD_CACHE_LIMIT = 16
+
+# Formato: cabeçalho, retângulos dos prédios e um bloco zlib com os pixels
+# do fundo (RGB) seguidos dos pixels de cada prédio (BGRA, o formato das
+# superfícies SRCALPHA), tudo em little-endian
+_MAGIC = b"GWLD"
+_HEADER = struct.Struct("<4sIIIqI")   # magic, versão, largura, altura, semente, prédios
+_RECT = struct.Struct("<iiII")        # x, y, largura, altura
+_COMPRESS_LEVEL = 6
+
+def world_cache_path(seed, size, generator_version):
+    """Arquivo do cenário de uma semente numa resolução e versão do gerador"""
+    width, height = size
+    return os.path.join(WORLD_CACHE_DIR, f"world_{seed}_{width}x{height}_v{generator_version}.bin")
+
+def save_world(seed, size, generator_version, background, buildings):
+    """
+    Grava o fundo e os prédios (retângulo e superfície) de um cenário gerado.
+    """
+    header = _HEADER.pack(_MAGIC, generator_version, size[0], size[1], seed, len(buildings))
+    rects = b"".join(_RECT.pack(*b["rect"]) for b in buildings)
+    pixels = [pygame.image.tobytes(background, "RGB")]
+    pixels.extend(pygame.image.tobytes(b["surf"], "BGRA") for b in buildings)
+    path = world_cache_path(seed, size, generator_version)
+    # Gravação segura (arquivo temporário + os.replace) na thread de fundo;
+    # a limpeza do cache roda depois, já enxergando o arquivo novo
+    game_storage.write_async(path, header + rects + zlib.compress(b"".join(pixels), _COMPRESS_LEVEL),
+                             then=prune_world_cache)
+    return path
+
+def load_world(seed, size, generator_version):
+    """
+    Lê um cenário do cache.
+
+    Returns:
+        (fundo, prédios) com prédios no formato {"surf", "rect"}, ou None se
+        não estiver no cache ou o arquivo não corresponder à chave
+    """
+    path = world_cache_path(seed, size, generator_version)
+    data = game_storage.read_bytes(path)
+    if data is None:
+        return None
+    try:
+        magic, version, width, height, file_seed, count = _HEADER.unpack_from(data)
+        if (magic, version, (width, height), file_seed) != (_MAGIC, generator_version, tuple(size), seed):
+            return None
+        offset = _HEADER.size
+        rects = []
+        for _ in range(count):
+            rects.append(pygame.Rect(_RECT.unpack_from(data, offset)))
+            offset += _RECT.size
+        pixels = memoryview(zlib.decompress(data[offset:]))
+    except (struct.error, zlib.error):
+        return None
+    if len(pixels) != width * height * 3 + sum(r.width * r.height * 4 for r in rects):
+        return None
+
+    # Fundo opaco copiado para uma superfície no formato padrão
+    end = width * height * 3
+    background = pygame.Surface((width, height))
+    background.blit(pygame.image.frombuffer(pixels[:end], (width, height), "RGB"), (0, 0))
+    buildings = []
+    for rect in rects:
+        start, end = end, end + rect.width * rect.height * 4
+        # frombuffer só referencia o bloco descomprimido; copy() dá ao prédio seus próprios pixels
+        surf = pygame.image.frombuffer(pixels[start:end], rect.size, "BGRA").copy()
+        buildings.append({"surf": surf, "rect": rect})
+    # Marcar como usado recentemente (para a limpeza do cache)
+    try:
+        os.utime(path)
+    except OSError:
+        pass  # Ainda na fila de gravação
+    return background, buildings
+
+def prune_world_cache(limit=WORLD_CACHE_LIMIT):
+    """Remove os cenários usados há mais tempo além do limite"""
+    try:
+        names = [n for n in os.listdir(WORLD_CACHE_DIR) if n.endswith(".bin")]
+    except OSError:
+        return
+    paths = sorted((os.path.join(WORLD_CACHE_DIR, n) for n in names), key=os.path.getmtime, reverse=True)
+    for path in paths[limit:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
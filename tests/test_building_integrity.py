@@ -0,0 +1,49 @@
+"""The incremental base-integrity tracker must agree with a full scan of the building base."""
+
+import os
+import random
+import sys
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame
+import main as game
+
+def full_scan(surf):
+    """Reference: count the visible pixels of the base one by one, as the game did before the tracker."""
+    width, height = surf.get_size()
+    base_check_height = min(30, height // 5)
+    intact = sum(1 for px in range(width) for py in range(height - base_check_height, height)
+                 if surf.get_at((px, py))[3] > 0)
+    return intact, intact / (width * base_check_height) < 0.3
+
+def random_building(rng):
+    width, height = rng.randint(80, 200), rng.randint(150, 400)
+    surf = pygame.Surface((width, height), pygame.SRCALPHA)
+    surf.fill((130, 70, 60, 255))
+    return {"surf": surf, "rect": pygame.Rect(rng.randint(0, 500), rng.randint(0, 300), width, height)}
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.quit()
+
+@pytest.mark.parametrize("seed", [1, 2, 3, 1234])
+def test_tracker_matches_full_scan(seed):
+    rng = random.Random(seed)
+    for _ in range(10):
+        building = random_building(rng)
+        rect = building["rect"]
+        for _ in range(rng.randint(1, 30)):
+            # Most hits near the base so some buildings collapse; some miss the edges
+            center = (rng.uniform(rect.left - 30, rect.right + 30),
+                      rng.uniform(rect.top + rect.height * 0.6, rect.bottom + 30))
+            collapsed = game.damage_building(building, center, rng.choice([10, 25, 50]))
+            intact, expected = full_scan(building["surf"])
+            assert building["base_intact"] == intact
+            assert collapsed == expected
@@ -0,0 +1,68 @@
+"""The vectorized solver must approximate simulation.simulate_shot closely."""
+
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pygame
+import main as game
+import simulation
+import solver
+
+KINDS = {solver.HIT_NONE: "timeout", solver.HIT_OUT: "out", solver.HIT_BUILDING: "building",
+         solver.HIT_TARGET: "gorilla", solver.HIT_SELF: "gorilla"}
+# Impact points this close count as the same outcome
+MAX_DISTANCE = 2.0
+# Share of shots allowed to differ: the solver samples each step's whole
+# segment on a world bitmap, simulate_shot the span clipped to each
+# building, so a segment that only grazes a building corner can differ
+MAX_DISAGREEMENT = 0.01
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.quit()
+
+def damaged_world(seed):
+    """A generated city with some craters near the rooftops, so building edges are ragged."""
+    rng = random.Random(seed)
+    buildings = game.generate_buildings(game.SCREEN_WIDTH, game.SCREEN_HEIGHT, rng)
+    for b in buildings:
+        game.init_building_integrity(b)
+    for _ in range(15):
+        b = rng.choice(buildings)
+        rect = b["rect"]
+        game.damage_building(b, (rng.uniform(rect.left, rect.right), rng.uniform(rect.top, rect.top + 80)),
+                             game.EXPLOSION_RADIUS)
+    return simulation.make_world(buildings, game.place_players(buildings), game.SIM_RULES), rng
+
+def distance(x, y, result):
+    return float(np.hypot(x - result.x, y - result.y))
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_hit_map_approximates_simulate_shot(seed):
+    world, rng = damaged_world(seed)
+    angles = np.arange(5, 86, 6, dtype=np.float64)
+    powers = np.arange(10, 101, 10, dtype=np.float64)
+    total = differ = 0
+    for shooter in (0, 1):
+        wind = rng.randint(-10, 10)
+        hit_map = solver.hit_map(world, wind, game.GRAVITY, shooter, angles, powers, game.SIM_RULES)
+        for i, angle in enumerate(angles):
+            for j, power in enumerate(powers):
+                result = simulation.simulate_shot(world, angle, power, wind, game.GRAVITY, shooter, game.SIM_RULES)
+                same = (KINDS[int(hit_map.kind[i, j])] == result.kind
+                        and distance(hit_map.x[i, j], hit_map.y[i, j], result) <= MAX_DISTANCE)
+                if same and result.kind == "building":
+                    same = int(hit_map.building[i, j]) == result.building
+                total += 1
+                differ += not same
+    assert differ <= total * MAX_DISAGREEMENT